@@ -0,0 +1,155 @@
+import argparse
+import csv
+import importlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+solver = importlib.import_module('2105166_offline1')
+
+FIELDS = ['board', 'size', 'search', 'heuristic', 'status', 'moves',
+          'expanded', 'explored', 'time', 'peak_kb']
+
+
+def random_walk(n, steps, rng):
+    board = solver.Tiles(n, solver.get_layout(n).goal)
+    previous = None
+    for _ in range(steps):
+        options = [child for child in board.childs() if child.key != previous]
+        previous = board.key
+        board = rng.choice(options)
+    return board
+
+
+def generate(sizes, count, walk, seed):
+    rng = random.Random(seed)
+    return [random_walk(n, walk, rng) for n in sizes for _ in range(count)]
+
+
+def load_instances(path):
+    boards = []
+    with open(path) as f:
+        for index, (n, tiles) in enumerate(solver.read_boards(f)):
+            if n is None:
+                print(f"Skipping board {index}: {tiles}", file=sys.stderr)
+                continue
+            boards.append(solver.Tiles(n, tiles))
+    return boards
+
+
+def board_key(board):
+    return ' '.join(map(str, board.flat()))
+
+
+def run(board, search, heuristic, time_limit, node_limit, repeat=1, memory=True):
+    solve = solver.SEARCHES[search]
+    elapsed = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solution, expanded, explored = solve(board, heuristic, max_nodes=node_limit, time_limit=time_limit)
+        took = time.perf_counter() - start
+        elapsed = took if elapsed is None else min(elapsed, took)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        solve(board, heuristic, max_nodes=node_limit, time_limit=time_limit)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        'board': board_key(board),
+        'size': board.size,
+        'search': search,
+        'heuristic': heuristic,
+        'status': 'solved' if solution else 'limit',
+        'moves': len(solution) - 1 if solution else None,
+        'expanded': expanded,
+        'explored': explored,
+        'time': round(elapsed, 6),
+        'peak_kb': peak // 1024 if peak is not None else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    previous = {(r['board'], r['search'], r['heuristic']): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result['board'], result['search'], result['heuristic']))
+        if old is None:
+            continue
+        if result['status'] != old['status'] or result['moves'] != old['moves']:
+            regressions.append((result, old, 'result changed'))
+        elif result['expanded'] > old['expanded']:
+            regressions.append((result, old, 'more nodes expanded'))
+        elif result['time'] > old['time'] * tolerance and result['time'] - old['time'] > 0.01:
+            regressions.append((result, old, 'slower'))
+    return regressions
+
+
+def write_results(results, out, fmt):
+    if fmt == 'json':
+        json.dump(results, out, indent=1)
+        out.write('\n')
+    else:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the n-puzzle solver")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 4])
+    parser.add_argument('--count', type=int, default=10, help="instances per size")
+    parser.add_argument('--walk', type=int, default=40, help="random walk length from the goal")
+    parser.add_argument('--seed', type=int, default=318)
+    parser.add_argument('--instances', help="read boards from a file (one per line) instead of generating them")
+    parser.add_argument('--searches', nargs='+', default=['a_star', 'ida_star', 'bidirectional'],
+                        choices=sorted(solver.SEARCHES))
+    parser.add_argument('--heuristics', nargs='+', default=['hamming', 'euclidean', 'manhattan', 'linear_conflict'],
+                        choices=sorted(solver.HEURISTICS))
+    parser.add_argument('--time-limit', type=float, default=30.0, help="per-run time limit in seconds")
+    parser.add_argument('--node-limit', type=int, help="per-run limit on expanded nodes")
+    parser.add_argument('--repeat', type=int, default=1, help="timed runs per variant; the fastest is kept")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced run that measures peak memory")
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+    parser.add_argument('--output', help="write results here instead of stdout")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="allowed slowdown factor against the baseline")
+    args = parser.parse_args()
+
+    boards = load_instances(args.instances) if args.instances else generate(args.sizes, args.count, args.walk, args.seed)
+
+    results = []
+    for board in boards:
+        for search in args.searches:
+            for heuristic in args.heuristics:
+                if search == 'bidirectional' and heuristic != 'manhattan':
+                    continue
+                result = run(board, search, heuristic, args.time_limit, args.node_limit,
+                             args.repeat, not args.no_memory)
+                results.append(result)
+                print(f"{result['size']}x{result['size']} {search:<13} {heuristic:<15} {result['status']:<6} "
+                      f"moves={result['moves']} expanded={result['expanded']} time={result['time']:.3f}s "
+                      f"peak={result['peak_kb']}KB", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as out:
+            write_results(results, out, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for result, old, reason in regressions:
+            print(f"REGRESSION ({reason}): {result['search']}/{result['heuristic']} on {result['board']}: "
+                  f"expanded {old['expanded']} -> {result['expanded']}, time {old['time']:.3f}s -> {result['time']:.3f}s",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,165 +1,489 @@
+import argparse
 import heapq
+import json
 import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from pattern_db import PatternDatabase, build_all
+
+DEBUG_HEURISTICS = False
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb_cache')
+
+class Layout:
+    def __init__(self, n):
+        self.size = n
+        self.cells = n * n
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.goal = tuple(
+            tuple((i * n + j + 1) % self.cells for j in range(n))
+            for i in range(n)
+        )
+        self.goal_key = self.pack([tile for row in self.goal for tile in row])
+        self.neighbors = tuple(
+            tuple((x + dx) * n + y + dy for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]
+                  if 0 <= x + dx < n and 0 <= y + dy < n)
+            for x, y in (divmod(pos, n) for pos in range(self.cells))
+        )
+        self.rows = tuple(tuple(i * n + j for j in range(n)) for i in range(n))
+        self.cols = tuple(tuple(j * n + i for j in range(n)) for i in range(n))
+        self.distance = [[0] * self.cells]
+        for tile in range(1, self.cells):
+            target_i, target_j = divmod(tile - 1, n)
+            self.distance.append([
+                abs(target_i - i) + abs(target_j - j)
+                for i, j in (divmod(pos, n) for pos in range(self.cells))
+            ])
+
+    def pack(self, flat):
+        key = 0
+        for pos, tile in enumerate(flat):
+            key |= tile << (pos * self.bits)
+        return key
+
+    def unpack(self, key):
+        return [(key >> (pos * self.bits)) & self.mask for pos in range(self.cells)]
+
+    def distance_to(self, target):
+        home = [0] * self.cells
+        for pos, tile in enumerate(target):
+            home[tile] = pos
+        table = [[0] * self.cells]
+        for tile in range(1, self.cells):
+            target_i, target_j = divmod(home[tile], self.size)
+            table.append([
+                abs(target_i - i) + abs(target_j - j)
+                for i, j in (divmod(pos, self.size) for pos in range(self.cells))
+            ])
+        return table
+
+    def target_distance(self, key, table):
+        bits, mask = self.bits, self.mask
+        return sum(table[(key >> (pos * bits)) & mask][pos] for pos in range(self.cells))
+
+    def line_conflicts(self, key, line, axis, index):
+        n, bits, mask = self.size, self.bits, self.mask
+        conflicts = 0
+        seen = -1
+        for pos in line:
+            val = (key >> (pos * bits)) & mask
+            if val != 0 and divmod(val - 1, n)[axis] == index:
+                if val > seen:
+                    seen = val
+                else:
+                    conflicts += 1
+        return conflicts
+
+    def conflict_delta(self, key, child_key, tile, pos, blank):
+        n = self.size
+        target_i, target_j = divmod(tile - 1, n)
+        if pos // n == blank // n:
+            if target_j == pos % n or target_j == blank % n:
+                line = self.cols[target_j]
+                return (self.line_conflicts(child_key, line, 1, target_j)
+                        - self.line_conflicts(key, line, 1, target_j))
+        elif target_i == pos // n or target_i == blank // n:
+            line = self.rows[target_i]
+            return (self.line_conflicts(child_key, line, 0, target_i)
+                    - self.line_conflicts(key, line, 0, target_i))
+        return 0
+
+
+layouts = {}
+
+def get_layout(n):
+    layout = layouts.get(n)
+    if layout is None:
+        layout = layouts[n] = Layout(n)
+    return layout
+
 
 class Tiles:
+    __slots__ = ('size', 'layout', 'key', 'blank', 'md', 'lc')
+
     def __init__(self, n, tiles):
+        flat = [tile for row in tiles for tile in row]
         self.size = n
-        self.board = tuple(tuple(row) for row in tiles)
-        self.blank = self.where_blank()
-        self.end = self.where_end()
+        self.layout = get_layout(n)
+        self.key = self.layout.pack(flat)
+        self.blank = flat.index(0)
+        self.md = self.full_manhattan()
+        self.lc = self.full_linear_conflict()
+
+    @classmethod
+    def from_key(cls, layout, key, blank, md=None, lc=None):
+        tiles = cls.__new__(cls)
+        tiles.size = layout.size
+        tiles.layout = layout
+        tiles.key = key
+        tiles.blank = blank
+        tiles.md = tiles.full_manhattan() if md is None else md
+        tiles.lc = tiles.full_linear_conflict() if lc is None else lc
+        return tiles
+
+    @property
+    def board(self):
+        flat = self.flat()
+        return tuple(tuple(flat[i * self.size:(i + 1) * self.size]) for i in range(self.size))
+
+    @property
+    def end(self):
+        return self.layout.goal
+
+    def flat(self):
+        return self.layout.unpack(self.key)
 
     def where_blank(self):
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    return (i, j)
+        return divmod(self.blank, self.size)
 
     def where_end(self):
-        return tuple(
-            tuple((i * self.size + j + 1) % (self.size * self.size) for j in range(self.size))
-            for i in range(self.size)
-        )
+        return self.layout.goal
 
     def is_goal(self):
-        return self.board == self.end
+        return self.key == self.layout.goal_key
 
     def hamming(self):
         count = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                val = self.board[i][j]
-                if val != 0 and val != self.end[i][j]:
-                    count += 1
+        for pos, val in enumerate(self.flat()):
+            if val != 0 and val != pos + 1:
+                count += 1
         return count
     
     def euclidean(self):
         distance = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                val = self.board[i][j]
-                if val != 0:
-                    target_i = (val - 1) // self.size
-                    target_j = (val - 1) % self.size
-                    distance += math.sqrt((target_i - i) ** 2 + (target_j - j) ** 2)
+        for pos, val in enumerate(self.flat()):
+            if val != 0:
+                i, j = divmod(pos, self.size)
+                target_i = (val - 1) // self.size
+                target_j = (val - 1) % self.size
+                distance += math.sqrt((target_i - i) ** 2 + (target_j - j) ** 2)
         return distance
 
     def manhattan(self):
+        return self.md
+
+    def linear_conflict(self):
+        return self.lc
+
+    def full_manhattan(self):
         distance = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                val = self.board[i][j]
-                if val != 0:
-                    target_i = (val - 1) // self.size
-                    target_j = (val - 1) % self.size
-                    distance += abs(target_i - i) + abs(target_j - j)
+        for pos, val in enumerate(self.flat()):
+            if val != 0:
+                i, j = divmod(pos, self.size)
+                target_i = (val - 1) // self.size
+                target_j = (val - 1) % self.size
+                distance += abs(target_i - i) + abs(target_j - j)
         return distance
 
-    def linear_conflict(self):
+    def full_linear_conflict(self):
+        flat = self.flat()
+        n = self.size
         conflicts = 0
-        for i in range(self.size):
+        for i in range(n):
             seen = -1
-            for j in range(self.size):
-                val = self.board[i][j]
-                if val != 0 and (val - 1) // self.size == i:
+            for j in range(n):
+                val = flat[i * n + j]
+                if val != 0 and (val - 1) // n == i:
                     if val > seen:
                         seen = val
                     else:
                         conflicts += 1
             seen = -1
-            for j in range(self.size):
-                val = self.board[j][i]
-                if val != 0 and (val - 1) % self.size == i:
+            for j in range(n):
+                val = flat[j * n + i]
+                if val != 0 and (val - 1) % n == i:
                     if val > seen:
                         seen = val
                     else:
                         conflicts += 1
         return conflicts
 
+    def copy(self):
+        return Tiles.from_key(self.layout, self.key, self.blank, self.md, self.lc)
+
+    def make_move(self, pos):
+        layout = self.layout
+        key, blank = self.key, self.blank
+        tile = (key >> (pos * layout.bits)) & layout.mask
+        self.key = key + (tile << (blank * layout.bits)) - (tile << (pos * layout.bits))
+        self.blank = pos
+        self.md += layout.distance[tile][blank] - layout.distance[tile][pos]
+        self.lc += layout.conflict_delta(key, self.key, tile, pos, blank)
+        return blank
+
+    def unmake_move(self, blank):
+        self.make_move(blank)
+
+    def check_heuristics(self):
+        assert self.md == self.full_manhattan(), f"manhattan drifted:\n{self}"
+        assert self.lc == self.full_linear_conflict(), f"linear conflict drifted:\n{self}"
 
     def childs(self):
+        layout = self.layout
+        bits, mask, distance = layout.bits, layout.mask, layout.distance
+        key, blank = self.key, self.blank
         children = []
-        x, y = self.blank
-        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size:
-                new_board = [list(row) for row in self.board]
-                new_board[x][y], new_board[nx][ny] = new_board[nx][ny], new_board[x][y]
-                children.append(Tiles(self.size, new_board))
+        for pos in layout.neighbors[blank]:
+            tile = (key >> (pos * bits)) & mask
+            child_key = key + (tile << (blank * bits)) - (tile << (pos * bits))
+            md = self.md - distance[tile][pos] + distance[tile][blank]
+            lc = self.lc + layout.conflict_delta(key, child_key, tile, pos, blank)
+            children.append(Tiles.from_key(layout, child_key, pos, md, lc))
         return children
 
     def __hash__(self):
-        return hash(self.board)
+        return hash(self.key)
 
     def __eq__(self, other):
-        return isinstance(other, Tiles) and self.board == other.board
+        return isinstance(other, Tiles) and self.size == other.size and self.key == other.key
 
     def __repr__(self):
         return '\n'.join(' '.join(map(str, row)) for row in self.board)
 
 
+pattern_databases = {}
+
+def pattern_database(board):
+    pdb = pattern_databases.get(board.size)
+    if pdb is None:
+        pdb = pattern_databases[board.size] = PatternDatabase(board.size, PDB_DIR)
+    return pdb.h(board.flat())
+
+
+HEURISTICS = {
+    'hamming': Tiles.hamming,
+    'euclidean': Tiles.euclidean,
+    'manhattan': Tiles.manhattan,
+    'linear_conflict': lambda board: board.manhattan() + 2 * board.linear_conflict(),
+    'pdb': pattern_database,
+}
+
+
 class node:
-    def __init__(self, board, moves, prev):
+    def __init__(self, board, moves, prev, heuristic=HEURISTICS['linear_conflict']):
         self.board = board
         self.moves = moves
         self.prev = prev
-        self.hvalue = board.manhattan() + 2 * board.linear_conflict()
-        # self.hvalue = board.hamming()
-        # self.hvalue = board.euclidean()
-        # self.hvalue = board.manhattan()
+        if DEBUG_HEURISTICS:
+            board.check_heuristics()
+        self.hvalue = heuristic(board)
         self.tvalue = self.moves + self.hvalue
 
-    def __lt__(self, other):
-        return self.tvalue < other.tvalue
+
+class SearchLimit(Exception):
+    pass
 
 
-def a_star(start_board):
-    open_set = []
-    heapq.heappush(open_set, node(start_board, 0, None))
+def a_star(start_board, heuristic='linear_conflict', max_nodes=None, time_limit=None):
+    h = HEURISTICS[heuristic]
+    deadline = time.monotonic() + time_limit if time_limit else None
+    start = node(start_board, 0, None, h)
+    open_set = [(start.tvalue, 0, 0, start)]
+    pushes = 1
 
     closed_set = set()
-    g_scores = {start_board: 0}
+    g_scores = {start_board.key: 0}
 
     expanded = 0
     explored = 0
 
     while open_set:
-        current = heapq.heappop(open_set)
+        _, _, _, current = heapq.heappop(open_set)
+        key = current.board.key
+        if key in closed_set or g_scores[key] < current.moves:
+            continue
         expanded += 1
+        if max_nodes and expanded > max_nodes:
+            break
+        if deadline and expanded % 1024 == 0 and time.monotonic() > deadline:
+            break
 
         if current.board.is_goal():
             return reconstruct_path(current), expanded, explored
 
-        closed_set.add(current.board)
+        closed_set.add(key)
 
+        tentative_g = current.moves + 1
         for child in current.board.childs():
-            if child in closed_set:
+            if child.key in closed_set:
                 continue
 
-            tentative_g = current.moves + 1
-            if child not in g_scores or tentative_g < g_scores[child]:
-                g_scores[child] = tentative_g
-                heapq.heappush(open_set, node(child, tentative_g, current))
+            if tentative_g < g_scores.get(child.key, math.inf):
+                g_scores[child.key] = tentative_g
+                item = node(child, tentative_g, current, h)
+                heapq.heappush(open_set, (item.tvalue, -tentative_g, pushes, item))
+                pushes += 1
                 explored += 1
 
     return None, expanded, explored
 
-def is_solvable(tiles, size):
-    flat = [tile for row in tiles for tile in row if tile != 0]
-    
+def ida_star(start_board, heuristic='linear_conflict', max_nodes=None, time_limit=None):
+    h = HEURISTICS[heuristic]
+    deadline = time.monotonic() + time_limit if time_limit else None
+    board = start_board.copy()
+    neighbors = board.layout.neighbors
+    moves = []
+
+    expanded = 0
+    explored = 0
+
+    def search(g, bound, parent):
+        nonlocal expanded, explored
+        if DEBUG_HEURISTICS:
+            board.check_heuristics()
+        tvalue = g + h(board)
+        if tvalue > bound:
+            return tvalue
+        if board.is_goal():
+            return None
+
+        expanded += 1
+        if max_nodes and expanded > max_nodes:
+            raise SearchLimit()
+        if deadline and expanded % 1024 == 0 and time.monotonic() > deadline:
+            raise SearchLimit()
+        blank = board.blank
+        minimum = math.inf
+        for pos in neighbors[blank]:
+            if pos == parent:
+                continue
+            explored += 1
+            board.make_move(pos)
+            moves.append(pos)
+            result = search(g + 1, bound, blank)
+            if result is None:
+                return None
+            moves.pop()
+            board.unmake_move(blank)
+            minimum = min(minimum, result)
+        return minimum
+
+    bound = h(board)
+    while True:
+        try:
+            result = search(0, bound, None)
+        except SearchLimit:
+            return None, expanded, explored
+        if result is None:
+            break
+        if result == math.inf:
+            return None, expanded, explored
+        bound = result
+
+    board = start_board.copy()
+    path = [start_board]
+    for pos in moves:
+        board.make_move(pos)
+        path.append(board.copy())
+    return path, expanded, explored
+
+class Frontier:
+    def __init__(self, root, heuristic):
+        self.heuristic = heuristic
+        self.g = {}
+        self.nodes = {}
+        self.closed = set()
+        self.by_priority = []
+        self.by_f = []
+        self.by_g = []
+        self.push(node(root, 0, None, heuristic))
+
+    def push(self, item):
+        key, g = item.board.key, item.moves
+        self.g[key] = g
+        self.nodes[key] = item
+        self.closed.discard(key)
+        heapq.heappush(self.by_priority, (max(item.tvalue, 2 * g), g, key))
+        heapq.heappush(self.by_f, (item.tvalue, g, key))
+        heapq.heappush(self.by_g, (g, g, key))
+
+    def min(self, heap):
+        while heap and (heap[0][2] in self.closed or self.g[heap[0][2]] != heap[0][1]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else math.inf
+
+    def pop(self):
+        self.min(self.by_priority)
+        _, _, key = heapq.heappop(self.by_priority)
+        self.closed.add(key)
+        return self.nodes[key]
+
+
+def bidirectional(start_board, heuristic='manhattan', max_nodes=None, time_limit=None):
+    if heuristic != 'manhattan':
+        raise ValueError("bidirectional search only supports the manhattan heuristic")
+    deadline = time.monotonic() + time_limit if time_limit else None
+    layout = start_board.layout
+    to_start = layout.distance_to(start_board.flat())
+
+    forward = Frontier(start_board, Tiles.manhattan)
+    backward = Frontier(Tiles(start_board.size, start_board.where_end()),
+                        lambda board: layout.target_distance(board.key, to_start))
+
+    best = 0 if start_board.is_goal() else math.inf
+    meeting = start_board.key if start_board.is_goal() else None
+
+    expanded = 0
+    explored = 0
+
+    while True:
+        forward_priority = forward.min(forward.by_priority)
+        backward_priority = backward.min(backward.by_priority)
+        bound = max(min(forward_priority, backward_priority),
+                    forward.min(forward.by_f), backward.min(backward.by_f),
+                    forward.min(forward.by_g) + backward.min(backward.by_g) + 1)
+        if best <= bound or bound == math.inf:
+            break
+
+        expanded += 1
+        if max_nodes and expanded > max_nodes:
+            return None, expanded, explored
+        if deadline and expanded % 1024 == 0 and time.monotonic() > deadline:
+            return None, expanded, explored
+
+        side, other = (forward, backward) if forward_priority <= backward_priority else (backward, forward)
+        current = side.pop()
+        for child in current.board.childs():
+            tentative_g = current.moves + 1
+            if side.g.get(child.key, math.inf) <= tentative_g:
+                continue
+            side.push(node(child, tentative_g, current, side.heuristic))
+            explored += 1
+            if child.key in other.g and tentative_g + other.g[child.key] < best:
+                best = tentative_g + other.g[child.key]
+                meeting = child.key
+
+    if meeting is None:
+        return None, expanded, explored
+    path = reconstruct_path(forward.nodes[meeting]) + reconstruct_path(backward.nodes[meeting])[-2::-1]
+    return path, expanded, explored
+
+def count_inversions(values):
+    tree = [0] * (max(values, default=0) + 1)
     inv_count = 0
-    for i in range(len(flat)):
-        for j in range(i + 1, len(flat)):
-            if flat[i] > flat[j]:
-                inv_count += 1
+    for seen, value in enumerate(values):
+        i = value
+        while i > 0:
+            seen -= tree[i]
+            i -= i & -i
+        inv_count += seen
+        i = value
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return inv_count
+
+def is_solvable(tiles, size):
+    flat = [tile for row in tiles for tile in row]
+    inv_count = count_inversions([tile for tile in flat if tile != 0])
 
     if size % 2 == 1:
         return inv_count % 2 == 0
     else:
-        for i in range(size):
-            for j in range(size):
-                if tiles[i][j] == 0:
-                    blank_row_from_bottom = size - i
-                    break
+        blank_row_from_bottom = size - flat.index(0) // size
         if blank_row_from_bottom % 2 == 0:
             return inv_count % 2 == 1
         else:
@@ -175,15 +499,151 @@ def reconstruct_path(node):
     return path[::-1]
 
 
+SEARCHES = {
+    'a_star': a_star,
+    'ida_star': ida_star,
+    'bidirectional': bidirectional,
+}
+
+
+def read_boards(stream):
+    for line in stream:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        try:
+            flat = list(map(int, line.split()))
+        except ValueError:
+            flat = None
+        n = math.isqrt(len(flat)) if flat else 0
+        if not flat or n * n != len(flat) or sorted(flat) != list(range(n * n)):
+            yield None, f"Not a valid board: {line}"
+            continue
+        yield n, [flat[i * n:(i + 1) * n] for i in range(n)]
+
+
+def init_worker(pdb_dir, debug_heuristics):
+    global PDB_DIR, DEBUG_HEURISTICS
+    PDB_DIR = pdb_dir
+    DEBUG_HEURISTICS = debug_heuristics
+
+
+def solve_batch_item(index, n, tiles, search, heuristic, time_limit, node_limit):
+    result = {'id': index, 'size': n, 'solvable': is_solvable(tiles, n)}
+    if not result['solvable']:
+        result['status'] = 'unsolvable'
+        return result
+
+    start = time.perf_counter()
+    options = {'heuristic': heuristic} if heuristic else {}
+    try:
+        solution, expanded, explored = SEARCHES[search](Tiles(n, tiles), max_nodes=node_limit,
+                                                        time_limit=time_limit, **options)
+    except Exception as e:
+        return error_result(index, e)
+    result['status'] = 'solved' if solution else 'limit'
+    result['moves'] = len(solution) - 1 if solution else None
+    result['expanded'] = expanded
+    result['explored'] = explored
+    result['time'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def invalid_result(index, error):
+    return {'id': index, 'status': 'invalid', 'error': error}
+
+
+def error_result(index, error):
+    return {'id': index, 'status': 'error', 'error': f"{type(error).__name__}: {error}"}
+
+
+def write_done(out, pending, done):
+    for future in done:
+        index = pending.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            result = error_result(index, e)
+        out.write(json.dumps(result) + '\n')
+    out.flush()
+
+
+def check_batch(stream, out):
+    for index, (n, tiles) in enumerate(read_boards(stream)):
+        if n is None:
+            out.write(json.dumps(invalid_result(index, tiles)) + '\n')
+            continue
+        out.write(json.dumps({'id': index, 'size': n, 'solvable': is_solvable(tiles, n)}) + '\n')
+
+
+def solve_batch(stream, out, workers=None, search='a_star', heuristic=None,
+                time_limit=None, node_limit=None):
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(PDB_DIR, DEBUG_HEURISTICS)) as pool:
+        window = 4 * workers
+        pending = {}
+        for index, (n, tiles) in enumerate(read_boards(stream)):
+            if n is None:
+                out.write(json.dumps(invalid_result(index, tiles)) + '\n')
+                out.flush()
+                continue
+            if len(pending) >= window:
+                write_done(out, pending, wait(pending, return_when=FIRST_COMPLETED).done)
+            future = pool.submit(solve_batch_item, index, n, tiles, search, heuristic, time_limit, node_limit)
+            pending[future] = index
+        while pending:
+            write_done(out, pending, wait(pending, return_when=FIRST_COMPLETED).done)
+
+
+
+def main():
+    global PDB_DIR, DEBUG_HEURISTICS
+    parser = argparse.ArgumentParser(description="n-puzzle solver")
+    parser.add_argument('--heuristic', choices=sorted(HEURISTICS), help="heuristic (default: the search's own default)")
+    parser.add_argument('--pdb-dir', default=PDB_DIR, help="pattern database cache directory")
+    parser.add_argument('--build-pdb', type=int, metavar='N', help="build the pattern databases for N x N boards and exit")
+    parser.add_argument('--search', choices=sorted(SEARCHES), default='a_star')
+    parser.add_argument('--batch', metavar='FILE', help="solve one board per line from FILE ('-' for stdin), printing JSON lines")
+    parser.add_argument('--workers', type=int, help="worker processes for --batch (default: CPU count)")
+    parser.add_argument('--time-limit', type=float, help="per-puzzle time limit in seconds")
+    parser.add_argument('--node-limit', type=int, help="per-puzzle limit on expanded nodes")
+    parser.add_argument('--check', action='store_true', help="only check solvability, without searching")
+    parser.add_argument('--debug-heuristics', action='store_true',
+                        help="recompute manhattan and linear conflict from scratch at every node and assert they match")
+    args = parser.parse_args()
+    if args.search == 'bidirectional' and args.heuristic not in (None, 'manhattan'):
+        parser.error("--search bidirectional only supports --heuristic manhattan")
+    PDB_DIR = args.pdb_dir
+    DEBUG_HEURISTICS = args.debug_heuristics
+
+    if args.build_pdb:
+        build_all(get_layout(args.build_pdb).goal, PDB_DIR,
+                  progress=lambda message: print(message, file=sys.stderr, flush=True))
+        return
+
+    if args.batch:
+        stream = sys.stdin if args.batch == '-' else open(args.batch)
+        with stream:
+            if args.check:
+                check_batch(stream, sys.stdout)
+                return
+            solve_batch(stream, sys.stdout, args.workers, args.search, args.heuristic,
+                        args.time_limit, args.node_limit)
+        return
+
+    search = SEARCHES[args.search]
+    options = {'heuristic': args.heuristic} if args.heuristic else {}
+    n = int(input("Enter board size: "))
+    tiles = [list(map(int, input().split())) for _ in range(n)]
+
+    if not is_solvable(tiles, n):
+        print("Unsolvable puzzle.")
+        return
+    if args.check:
+        print("Solvable puzzle.")
+        return
 
-n = int(input("Enter board size: "))
-tiles = [list(map(int, input().split())) for _ in range(n)]
-
-initial_board = Tiles(n, tiles)
-solution, expanded, explored = a_star(initial_board)
-
-if is_solvable(tiles, n):
-    solution, expanded, explored = a_star(initial_board)
+    solution, expanded, explored = search(Tiles(n, tiles), **options)
     if solution:
         print(f"Minimum moves: {len(solution) - 1}\n")
         for step, board in enumerate(solution):
@@ -192,6 +652,7 @@ if is_solvable(tiles, n):
         print(f"Total nodes explored: {explored}")
     else:
         print("Unsolvable puzzle.")
-else:
-    print("Unsolvable puzzle.")
 
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+
+tables = {}
+
+
+def goal_tables(n):
+    table = tables.get(n)
+    if table is None:
+        values = np.arange(n * n)
+        target_row = np.where(values > 0, (values - 1) // n, -1)
+        target_col = np.where(values > 0, (values - 1) % n, -1)
+        goal = ((np.arange(n * n) + 1) % (n * n)).reshape(n, n)
+        rows, cols = np.indices((n, n))
+        table = tables[n] = (goal, target_row, target_col, rows, cols)
+    return table
+
+
+def as_boards(boards):
+    boards = np.asarray(boards)
+    if boards.ndim == 2:
+        boards = boards[np.newaxis]
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"Expected an (N, n, n) array of boards, got shape {boards.shape}")
+    return boards
+
+
+def from_tiles(boards):
+    n = boards[0].size
+    return np.array([board.flat() for board in boards], dtype=np.int16).reshape(-1, n, n)
+
+
+def hamming(boards):
+    boards = as_boards(boards)
+    goal = goal_tables(boards.shape[1])[0]
+    return ((boards != 0) & (boards != goal)).sum(axis=(1, 2))
+
+
+def displacement(boards):
+    goal, target_row, target_col, rows, cols = goal_tables(boards.shape[1])
+    placed = boards != 0
+    return (np.where(placed, target_row[boards] - rows, 0),
+            np.where(placed, target_col[boards] - cols, 0))
+
+
+def euclidean(boards):
+    boards = as_boards(boards)
+    drow, dcol = displacement(boards)
+    return np.sqrt(drow ** 2 + dcol ** 2).sum(axis=(1, 2))
+
+
+def manhattan(boards):
+    boards = as_boards(boards)
+    drow, dcol = displacement(boards)
+    return (np.abs(drow) + np.abs(dcol)).sum(axis=(1, 2))
+
+
+def line_conflicts(lines, targets):
+    count, n = lines.shape[0], lines.shape[1]
+    index = np.arange(n)
+    conflicts = np.zeros(count, dtype=np.int64)
+    seen = np.full((count, n), -1, dtype=np.int64)
+    for j in range(n):
+        val = lines[:, :, j]
+        in_line = (val != 0) & (targets[val] == index)
+        greater = val > seen
+        conflicts += (in_line & ~greater).sum(axis=1)
+        seen = np.where(in_line & greater, val, seen)
+    return conflicts
+
+
+def linear_conflict(boards):
+    boards = as_boards(boards)
+    _, target_row, target_col, _, _ = goal_tables(boards.shape[1])
+    return (line_conflicts(boards, target_row)
+            + line_conflicts(boards.transpose(0, 2, 1), target_col))
+
+
+HEURISTICS = {
+    'hamming': hamming,
+    'euclidean': euclidean,
+    'manhattan': manhattan,
+    'linear_conflict': lambda boards: manhattan(boards) + 2 * linear_conflict(boards),
+}
@@ -0,0 +1,152 @@
+import mmap
+import os
+from array import array
+
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 6, 7), (3, 4, 8, 9), (5, 10, 15, 20),
+        (11, 12, 16, 17), (13, 14, 18, 19), (21, 22, 23, 24)),
+}
+
+UNSEEN = 255
+
+
+def table_size(cells, k):
+    size = 1
+    for i in range(k):
+        size *= cells - i
+    return size
+
+
+def rank(positions, cells):
+    index = 0
+    used = 0
+    for i, pos in enumerate(positions):
+        index = index * (cells - i) + pos - (used & ((1 << pos) - 1)).bit_count()
+        used |= 1 << pos
+    return index
+
+
+def unrank(index, k, cells):
+    digits = []
+    for i in range(k - 1, -1, -1):
+        index, digit = divmod(index, cells - i)
+        digits.append(digit)
+    positions = []
+    used = 0
+    for digit in reversed(digits):
+        pos = 0
+        while True:
+            if not used & (1 << pos):
+                if digit == 0:
+                    break
+                digit -= 1
+            pos += 1
+        positions.append(pos)
+        used |= 1 << pos
+    return positions
+
+
+def file_name(n, pattern):
+    return f"pdb-{n}-{'.'.join(map(str, pattern))}.bin"
+
+
+def build(goal, pattern, progress=None):
+    n = len(goal)
+    cells = n * n
+    flat_goal = [tile for row in goal for tile in row]
+    neighbors = [
+        [(x + dx) * n + y + dy for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]
+         if 0 <= x + dx < n and 0 <= y + dy < n]
+        for x, y in (divmod(pos, n) for pos in range(cells))
+    ]
+    k = len(pattern)
+    size = table_size(cells, k)
+    dist = bytearray([UNSEEN]) * (size * cells)
+
+    start = rank([flat_goal.index(tile) for tile in pattern], cells) * cells + flat_goal.index(0)
+    dist[start] = 0
+    level = array('Q', [start])
+    depth = 0
+    seen = 1
+
+    while level:
+        next_level = array('Q')
+        i = 0
+        while i < len(level):
+            state = level[i]
+            i += 1
+            if dist[state] != depth:
+                continue
+            index, blank = divmod(state, cells)
+            positions = unrank(index, k, cells)
+            for pos in neighbors[blank]:
+                if pos in positions:
+                    moved = positions.copy()
+                    moved[moved.index(pos)] = blank
+                    child = rank(moved, cells) * cells + pos
+                    if dist[child] > depth + 1:
+                        if dist[child] == UNSEEN:
+                            seen += 1
+                        dist[child] = depth + 1
+                        next_level.append(child)
+                else:
+                    child = index * cells + pos
+                    if dist[child] > depth:
+                        if dist[child] == UNSEEN:
+                            seen += 1
+                        dist[child] = depth
+                        level.append(child)
+            if progress and i % 1000000 == 0:
+                progress(f"  depth {depth}: {i} states expanded, {seen}/{size * cells} reached")
+        if progress:
+            progress(f"depth {depth} done: {len(level)} states, {seen}/{size * cells} reached")
+        level = next_level
+        depth += 1
+
+    table = bytearray(size)
+    for index in range(size):
+        table[index] = min(dist[index * cells:(index + 1) * cells])
+    return table
+
+
+def build_all(goal, cache_dir, partitions=None, progress=None):
+    n = len(goal)
+    partitions = partitions or PARTITIONS[n]
+    os.makedirs(cache_dir, exist_ok=True)
+    for pattern in partitions:
+        path = os.path.join(cache_dir, file_name(n, pattern))
+        if progress:
+            progress(f"Building {path}")
+        table = build(goal, pattern, progress)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(table)
+        os.replace(path + '.tmp', path)
+
+
+class PatternDatabase:
+    def __init__(self, n, cache_dir, partitions=None):
+        self.size = n
+        self.cells = n * n
+        self.partitions = partitions or PARTITIONS[n]
+        self.tables = []
+        for pattern in self.partitions:
+            path = os.path.join(cache_dir, file_name(n, pattern))
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Missing pattern database {path}; build it with --build-pdb {n}")
+            with open(path, 'rb') as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(table) != table_size(self.cells, len(pattern)):
+                raise ValueError(f"Pattern database {path} has the wrong size; rebuild it")
+            self.tables.append(table)
+
+    def h(self, flat):
+        where = [0] * self.cells
+        for pos, tile in enumerate(flat):
+            where[tile] = pos
+        cells = self.cells
+        return sum(
+            table[rank([where[tile] for tile in pattern], cells)]
+            for pattern, table in zip(self.partitions, self.tables)
+        )
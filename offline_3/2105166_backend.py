@@ -1,43 +1,142 @@
+import argparse
+import select
+import threading
 import time
-from base import GameState, AIPlayer
+import channel
+from base import GameState, AIPlayer, SIGN
 
 FILENAME = "gamestate.txt"
 ROWS, COLS = 6, 9 
 
-def read_game():
+def parse_game(text):
     try:
-        with open(FILENAME, "r") as f:
-            lines = [line.strip() for line in f if line.strip()]
-            if not lines or lines[0] not in ("Human Move:", "AI Move:"):
-                return None, None
-
-            move_type = lines[0]
-            board_lines = lines[1:ROWS+1]
-            if len(board_lines) != ROWS:
-                return None, None
-
-            board = []
-            for line in board_lines:
-                row = []
-                for cell_str in line.split():
-                    if cell_str == "0":
-                        row.append({'orb_count': 0, 'color': None})
-                    else:
-                        row.append({'orb_count': int(cell_str[:-1]), 'color': cell_str[-1]})
-                board.append(row)
-            return move_type, board
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines or lines[0] not in ("Human Move:", "AI Move:"):
+            return None, None
+
+        move_type = lines[0]
+        board_lines = lines[1:ROWS+1]
+        if len(board_lines) != ROWS:
+            return None, None
+
+        board = []
+        for line in board_lines:
+            row = []
+            for cell_str in line.split():
+                if cell_str == "0":
+                    row.append({'orb_count': 0, 'color': None})
+                else:
+                    row.append({'orb_count': int(cell_str[:-1]), 'color': cell_str[-1]})
+            board.append(row)
+        return move_type, board
     except Exception as e:
         print(f"Error reading gamestate: {e}")
         return None, None
 
-def write_game(state, move_type="AI Move"):
-    with open(FILENAME, "w") as f:
-        f.write(f"{move_type}:\n")
-        for row in state.grid:
-            f.write(" ".join(
-                "0" if cell['orb_count'] == 0 else f"{cell['orb_count']}{cell['color']}"
-                for cell in row
-            ) + "\n")
+def format_game(state, move_type="AI Move"):
+    return f"{move_type}:\n" + "".join(
+        " ".join("0" if cell['orb_count'] == 0 else f"{cell['orb_count']}{cell['color']}" for cell in row) + "\n"
+        for row in state.grid
+    )
+
+def read_game(seen=None):
+    try:
+        with open(FILENAME, "r") as f:
+            header = f.readline()
+            if not header.startswith(channel.SEQ_PREFIX):
+                return (None,) + parse_game(header + f.read())
+            header = header.strip()
+            if header == seen:
+                return header, None, None
+            return (header,) + parse_game(f.read())
+    except Exception as e:
+        print(f"Error reading gamestate: {e}")
+        return None, None, None
+
+def write_game(state, move_type="AI Move", header=None):
+    text = format_game(state, move_type)
+    channel.write_atomic(FILENAME, text if header is None else f"{header}\n{text}")
+
+class FileChannel:
+    def __init__(self):
+        self.last = None
+        self.seq = 0
+
+    def wait_for_game(self):
+        self.last = None
+        while True:
+            header, move_type, board = read_game()
+            if move_type and board:
+                return move_type
+            time.sleep(0.1)
+
+    def read(self):
+        while True:
+            header, move_type, board = read_game(self.last)
+            if header is not None and header == self.last:
+                time.sleep(0.1)
+                continue
+            if header is not None:
+                self.seq = max(self.seq, channel.sequence_number(header))
+            key = header or (hash(str(board)) if board else None)
+            if board is None or key != self.last:
+                self.last = key
+                return move_type, board
+            time.sleep(0.1)
+
+    def write(self, state, move_type="AI Move"):
+        self.seq += 1
+        write_game(state, move_type, channel.sequence_header(self.seq, "backend"))
+
+class SocketChannel:
+    def __init__(self, path=channel.SOCKET_PATH):
+        self.server = channel.listen(path)
+        self.conn = None
+        self.pending = None
+        self.last = None
+
+    def receive(self, timeout=None):
+        if self.conn is None:
+            if timeout == 0:
+                return None
+            self.conn, _ = self.server.accept()
+        if not select.select([self.conn], [], [], timeout)[0]:
+            return None
+        text = channel.recv_message(self.conn)
+        if text is None:
+            self.conn.close()
+            self.conn = None
+            return ''
+        return text
+
+    def wait_for_game(self):
+        self.last = self.pending = None
+        while True:
+            text = self.receive()
+            move_type, board = parse_game(text)
+            if move_type and board:
+                self.pending = text
+                return move_type
+
+    def read(self):
+        while True:
+            text = self.receive(0)
+            if text is None:
+                text, self.pending = self.pending, None
+            if text is None:
+                text = self.receive()
+            if text != self.last:
+                self.last = text
+                return parse_game(text)
+
+    def write(self, state, move_type="AI Move"):
+        self.pending = format_game(state, move_type)
+        if self.conn is not None:
+            try:
+                channel.send_message(self.conn, self.pending)
+            except OSError:
+                self.conn.close()
+                self.conn = None
 
 def load_state(board, player):
     game = GameState(rows=ROWS, cols=COLS)
@@ -45,64 +144,130 @@ def load_state(board, player):
     game.current_player = player
     return game
 
-def human_vs_ai():
+class Ponderer:
+    def __init__(self, ai, candidates=8, max_replies=32, start_ms=100, max_ms=6400):
+        self.ai = ai
+        self.candidates = candidates
+        self.max_replies = max_replies
+        self.start_ms = start_ms
+        self.max_ms = max_ms
+        self.replies = {}
+        self.stop = threading.Event()
+        self.thread = None
+
+    def start(self, game):
+        self.cancel()
+        self.replies = {}
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(game.clone(),), daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        if self.thread is not None:
+            self.stop.set()
+            self.thread.join()
+            self.thread = None
+        self.ai.stop = None
+
+    def lookup(self, game):
+        reply = self.replies.get(game.zobrist)
+        if reply is not None and reply[1] >= self.ai.depth:
+            self.ai.pv = reply[2]
+            return reply[0]
+        return None
+
+    def likely_positions(self, game):
+        human = game.clone()
+        human.current_player = self.ai.opponent
+        sign = SIGN[self.ai.opponent]
+        positions = []
+        for r, c in self.ai.order_moves(human, 1, None)[:self.candidates]:
+            state = game.clone()
+            state.cells[r * state.cols + c] += sign
+            state.current_player = self.ai.player
+            state.recount()
+            positions.append(state)
+        return positions
+
+    def run(self, game):
+        self.ai.stop = self.stop
+        positions = self.likely_positions(game)
+        budget = self.start_ms
+        while budget <= self.max_ms:
+            for state in positions:
+                move = self.ai.best_move(state, time_limit_ms=budget)
+                if self.stop.is_set():
+                    return
+                key = state.zobrist
+                if move is not None and (key in self.replies or len(self.replies) < self.max_replies):
+                    self.replies[key] = (move, self.ai.stats['depth'], self.ai.pv)
+            budget *= 2
+
+def human_vs_ai(link, ponder=False):
     print("Running in Human vs AI mode")
-    last_board = None
+    blue_weights = {
+        1: 1.0,
+        2: 1.2,
+        3: 1.5,
+        4: 1.0,
+        5: 0.3,
+    }
+    ai = AIPlayer('B', heuristic_weights=blue_weights, depth=3)
+    ponderer = Ponderer(ai) if ponder else None
+    try:
+        play_human_vs_ai(link, ai, ponderer)
+    finally:
+        if ponderer is not None:
+            ponderer.cancel()
+
+def play_human_vs_ai(link, ai, ponderer):
     last_winner = None
 
     while True:
-        time.sleep(0.1)
-
-        move_type, board = read_game()
+        move_type, board = link.read()
         if move_type is None and board is None:
             print("Gamestate cleared. Exiting Human vs AI mode.")
             return
 
-        board_hash = hash(str(board)) if board else None
-        if board_hash == last_board:
-            continue
-        last_board = board_hash
-
         if move_type == "Human Move:":
             continue
 
+        if ponderer is not None:
+            ponderer.cancel()
         game = load_state(board, 'B')
 
         if game.is_game_over or (last_winner := game.check_winner()):
             print(f"Game over! {last_winner} wins!")
-            write_game(game)
+            link.write(game)
             return
-        blue_weights = {
-        1: 1.0,
-        2: 1.2,
-        3: 1.5,
-        4: 1.0,
-        5: 0.3,
-         }
-        
-        ai = AIPlayer('B', heuristic_weights=blue_weights, depth=3)
-        move = ai.best_move(game)
+        move = ponderer.lookup(game) if ponderer is not None else None
+        if move is not None:
+            print("Answering from the ponder cache")
+        else:
+            move = ai.best_move(game)
 
         if not move:
             print("No valid moves for AI.")
-            write_game(game, "Human Move")
+            link.write(game, "Human Move")
             continue
 
         print(f"AI (Blue) move at {move}")
         game.place_orb(*move)
         game.process_explosions()
 
-        write_game(game, "Human Move")
+        link.write(game, "Human Move")
         print("AI move completed. Waiting for human...")
 
         if (last_winner := game.check_winner()):
             print(f"Game over! {last_winner} wins!")
-            write_game(game)
+            link.write(game)
             return
 
-def ai_vs_ai():
+        if ponderer is not None:
+            ponderer.start(game)
+
+def ai_vs_ai(link):
     print("Running in AI vs AI mode")
-    last_board = None
     current_player = 'R'
     last_winner = None
 
@@ -120,32 +285,24 @@ def ai_vs_ai():
         4: 1.0,
         5: 0.3,
     }
+    players = {
+        'R': AIPlayer('R', heuristic_weights=red_weights, depth=3),
+        'B': AIPlayer('B', heuristic_weights=blue_weights, depth=3),
+    }
 
     while True:
-        time.sleep(0.1)
-
-        _, board = read_game()
+        _, board = link.read()
         if board is None:
             print("Gamestate cleared. Exiting AI vs AI mode.")
             return
 
-        board_hash = hash(str(board))
-        if board_hash == last_board:
-            continue
-        last_board = board_hash
-
         game = load_state(board, current_player)
 
         if game.is_game_over or (last_winner := game.check_winner()):
             print(f"Game over! {last_winner} wins!")
             return
 
-        if current_player == 'R':
-            ai = AIPlayer(current_player, heuristic_weights=red_weights, depth=3)
-        else:
-            ai = AIPlayer(current_player, heuristic_weights=blue_weights, depth=3)
-
-        move = ai.best_move(game)
+        move = players[current_player].best_move(game)
 
         if not move:
             print(f"No valid moves for AI ({current_player}).")
@@ -156,7 +313,7 @@ def ai_vs_ai():
         game.place_orb(*move)
         game.process_explosions()
 
-        write_game(game)
+        link.write(game)
         print(f"AI move completed (next player: {'B' if current_player == 'R' else 'R'})")
 
         current_player = 'B' if current_player == 'R' else 'R'
@@ -168,29 +325,34 @@ def ai_vs_ai():
             return
 
 
-def backend_loop():
+def backend_loop(link, ponder=False):
     print("Backend started. Waiting for game mode...")
 
     while True:
-        move_type, board = None, None
-        while not (move_type and board):
-            move_type, board = read_game()
-            time.sleep(0.1)
+        move_type = link.wait_for_game()
 
         game_mode = "human_vs_ai" if move_type == "Human Move:" else "ai_vs_ai"
         print(f"Detected {game_mode} mode")
 
         if game_mode == "human_vs_ai":
-            human_vs_ai()
+            human_vs_ai(link, ponder)
         else:
-            ai_vs_ai()
+            ai_vs_ai(link)
 
         print("Returning to backend loop. Waiting for new game...")
 
 def clear_gamestate():
-    with open(FILENAME, 'w') as f:
-        f.write('')
+    channel.write_atomic(FILENAME, '')
 
 if __name__ == "__main__":
-    clear_gamestate()
-    backend_loop()
+    parser = argparse.ArgumentParser(description="Chain Reaction AI backend")
+    parser.add_argument('--file', action='store_true', help=f"poll {FILENAME} instead of listening on a socket")
+    parser.add_argument('--socket', default=channel.SOCKET_PATH, help="path of the Unix socket to listen on")
+    parser.add_argument('--ponder', action='store_true', help="keep searching while the human is thinking")
+    args = parser.parse_args()
+
+    if args.file:
+        clear_gamestate()
+        backend_loop(FileChannel(), args.ponder)
+    else:
+        backend_loop(SocketChannel(args.socket), args.ponder)
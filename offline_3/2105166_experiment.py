@@ -1,12 +1,16 @@
 import sys
+import threading
+import time
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QGridLayout, QPushButton,
     QVBoxLayout, QLabel, QHBoxLayout, QMessageBox, QStackedLayout, QComboBox
 )
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QRadialGradient, QFont
-from PyQt6.QtCore import QSize, Qt, QTimer
+from PyQt6.QtCore import QSize, Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 from game_logic import GameState, AIPlayer, RandomAgent
 
+AI_TIME_LIMIT_MS = 500
+
 
 class CellButton(QPushButton):
     def __init__(self, row, col):
@@ -70,6 +74,36 @@ class CellButton(QPushButton):
                 painter.drawEllipse(x, y, radius, radius)
 
 
+class SearchSignals(QObject):
+    progress = pyqtSignal(int, int, int)
+    finished = pyqtSignal(int, object, object)
+
+
+class SearchTask(QRunnable):
+    def __init__(self, ai, state, generation):
+        super().__init__()
+        self.ai = ai
+        self.state = state
+        self.generation = generation
+        self.cancelled = threading.Event()
+        self.signals = SearchSignals()
+
+    def report(self, depth, nodes):
+        self.signals.progress.emit(self.generation, depth, nodes)
+
+    def run(self):
+        searching = isinstance(self.ai, AIPlayer)
+        if searching:
+            self.ai.stop = self.cancelled
+            self.ai.progress = self.report
+        try:
+            move = self.ai.best_move(self.state)
+        finally:
+            if searching:
+                self.ai.stop = self.ai.progress = None
+        self.signals.finished.emit(self.generation, move, self.ai.stats if searching else None)
+
+
 class ChainReactionGame(QWidget):
     def __init__(self, rows=6, cols=9, ai_players=None, parent=None):
         super().__init__(parent)
@@ -83,6 +117,12 @@ class ChainReactionGame(QWidget):
         self.timer.timeout.connect(self.ai_move)
         self.timer.setSingleShot(True)
 
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.search = None
+        self.search_generation = 0
+        self.search_started = 0
+
         self.initUI()
 
         if self.is_ai_turn():
@@ -139,7 +179,14 @@ class ChainReactionGame(QWidget):
         if self.timer.isActive():
             self.timer.stop()
 
+    def cancel_search(self):
+        if self.search is not None:
+            self.search.cancelled.set()
+            self.search = None
+        self.search_generation += 1
+
     def go_back_to_menu(self):
+        self.cancel_search()
         self.safe_ai_move_stop()
         self.setParent(None)
         self.deleteLater()
@@ -158,9 +205,10 @@ class ChainReactionGame(QWidget):
 
     def update_ui_from_state(self):
         self.setUpdatesEnabled(False)
+        grid = self.game_state.grid
         for r in range(self.rows):
             for c in range(self.cols):
-                cell_state = self.game_state.grid[r][c]
+                cell_state = grid[r][c]
                 cell = self.cells[r][c]
                 if cell.orb_count != cell_state['orb_count'] or cell.color != cell_state['color']:
                     cell.set_orb(cell_state['orb_count'], cell_state['color'])
@@ -206,12 +254,39 @@ class ChainReactionGame(QWidget):
             self.safe_ai_move_stop()
             return
 
-        move = ai.best_move(self.game_state)
+        if self.search is not None:
+            return
+        self.search_generation += 1
+        self.search = SearchTask(ai, self.game_state.clone(), self.search_generation)
+        self.search.signals.progress.connect(self.show_progress)
+        self.search.signals.finished.connect(self.search_finished)
+        self.search_started = time.perf_counter()
+        self.status_label.setText(f"{self.player_name()} AI thinking...")
+        self.pool.start(self.search)
+
+    def player_name(self):
+        return 'Red' if self.game_state.current_player == 'R' else 'Blue'
+
+    def show_progress(self, generation, depth, nodes):
+        if generation != self.search_generation:
+            return
+        elapsed = time.perf_counter() - self.search_started
+        rate = nodes / elapsed if elapsed > 0 else 0
+        self.status_label.setText(f"{self.player_name()} AI thinking... depth {depth}, {rate:,.0f} nodes/s")
+
+    def search_finished(self, generation, move, stats):
+        if generation != self.search_generation:
+            return
+        self.search = None
         if not move:
             print(f"AI {self.game_state.current_player} has no valid moves.")
             self.safe_ai_move_stop()
             return
-        print(f"AI {self.game_state.current_player} move: {move}")
+        if stats:
+            print(f"AI {self.game_state.current_player} move: {move} "
+                  f"(depth {stats['depth']}, {stats['nodes']} nodes, {stats['time_ms']:.0f} ms)")
+        else:
+            print(f"AI {self.game_state.current_player} move: {move}")
 
         if move:
             r, c = move
@@ -235,6 +310,7 @@ class ChainReactionGame(QWidget):
         self.update_ui_from_state()
 
     def reset_game(self):
+        self.cancel_search()
         self.game_state.reset()
         self.update_ui_from_state()
         self.safe_ai_move_stop()
@@ -294,7 +370,7 @@ class ChainReactionApp(QWidget):
         elif choice == 1:
             return RandomAgent(color)
         else:
-            return AIPlayer(color, heuristic_id=choice)
+            return AIPlayer(color, heuristic_id=choice, time_limit_ms=AI_TIME_LIMIT_MS)
 
     def start_game(self):
         red_choice = self.red_player_combo.currentIndex()
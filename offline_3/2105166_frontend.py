@@ -1,16 +1,18 @@
 import sys
 import os
+import argparse
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QGridLayout, QPushButton,
     QVBoxLayout, QLabel, QHBoxLayout, QMessageBox, QStackedLayout
 )
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QRadialGradient, QFont
 from PyQt6.QtCore import QSize, Qt, QTimer
+from PyQt6.QtNetwork import QLocalSocket
+import channel
 
 
 def clear_gamestate():
-    with open("gamestate.txt", 'w'):
-        pass 
+    channel.write_atomic("gamestate.txt", '')
 
 
 class CellButton(QPushButton):
@@ -77,7 +79,8 @@ class CellButton(QPushButton):
 
 
 class ChainReactionGame(QWidget):
-    def __init__(self, rows=6, cols=9, mode="human_vs_ai", parent=None):
+    def __init__(self, rows=6, cols=9, mode="human_vs_ai", use_file=False, socket_path=channel.SOCKET_PATH,
+                 parent=None):
         super().__init__(parent)
         self.rows = rows
         self.cols = cols
@@ -86,65 +89,113 @@ class ChainReactionGame(QWidget):
         self.is_game_over = False
         self.mode = mode
         self.move_delay = 1000  
+        self.use_file = use_file
+        self.socket_path = os.path.abspath(socket_path)
+        self.socket = None
+        self.buffer = b''
+        self.pending = None
+        self.seq = 0
+        self.seen = None
         self.initUI()
-        self.init_game_state()
 
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_for_updates)
-        self.timer.start(1000)
+        if use_file:
+            self.timer.timeout.connect(self.check_for_updates)
+            self.timer.start(1000)
+        else:
+            self.socket = QLocalSocket(self)
+            self.socket.readyRead.connect(self.read_socket)
+            self.socket.connected.connect(self.flush_pending)
+            self.socket.errorOccurred.connect(self.socket_error)
+            self.socket.connectToServer(self.socket_path)
+        self.init_game_state()
+
+    def publish(self, text):
+        if self.use_file:
+            self.seq += 1
+            self.seen = channel.sequence_header(self.seq, "frontend")
+            channel.write_atomic(self.gamestate_file, f"{self.seen}\n{text}")
+        elif self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState:
+            self.socket.write(channel.pack(text))
+            self.socket.flush()
+        else:
+            self.pending = text
+
+    def flush_pending(self):
+        if self.pending is not None:
+            text, self.pending = self.pending, None
+            self.publish(text)
+
+    def socket_error(self, error):
+        print(f"[ERROR] Backend connection: {self.socket.errorString()}; retrying")
+        QTimer.singleShot(1000, self.reconnect)
+
+    def reconnect(self):
+        if self.socket is not None and self.socket.state() == QLocalSocket.LocalSocketState.UnconnectedState:
+            self.socket.connectToServer(self.socket_path)
+
+    def read_socket(self):
+        messages, self.buffer = channel.split_frames(self.buffer + bytes(self.socket.readAll()))
+        for text in messages:
+            self.apply_update(*self.parse_gamestate(text))
 
     def init_game_state(self):
-        with open(self.gamestate_file, 'w') as f:
-            if self.mode == "human_vs_ai":
-                f.write("Human Move:\n")
-                for _ in range(self.rows):
-                    f.write(" ".join(["0"] * self.cols) + "\n")
-            else:  
-                f.write("AI Move:\n")
-                initial_board = [["0"] * self.cols for _ in range(self.rows)]
-                initial_board[0][0] = "1R"
-                initial_board[-1][-1] = "1B"
-                for row in initial_board:
-                    f.write(" ".join(row) + "\n")
+        if self.mode == "human_vs_ai":
+            initial_board = [["0"] * self.cols for _ in range(self.rows)]
+            header = "Human Move:"
+        else:  
+            initial_board = [["0"] * self.cols for _ in range(self.rows)]
+            initial_board[0][0] = "1R"
+            initial_board[-1][-1] = "1B"
+            header = "AI Move:"
+        self.publish(header + "\n" + "".join(" ".join(row) + "\n" for row in initial_board))
 
     def write_gamestate(self):
         if self.mode != "human_vs_ai":
             return
         try:
-            with open(self.gamestate_file, 'w') as f:
-                f.write("AI Move:\n")
-                for row in self.cells:
-                    line = [
-                        "0" if cell.orb_count == 0 else f"{cell.orb_count}{cell.color}"
-                        for cell in row
-                    ]
-                    f.write(" ".join(line) + "\n")
+            lines = [
+                " ".join("0" if cell.orb_count == 0 else f"{cell.orb_count}{cell.color}" for cell in row)
+                for row in self.cells
+            ]
+            self.publish("AI Move:\n" + "".join(line + "\n" for line in lines))
         except Exception as e:
             print(f"Error writing gamestate: {e}")
 
+    def parse_gamestate(self, text):
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines or lines[0] not in ("Human Move:", "AI Move:"):
+            return None, None
+
+        header = lines[0]
+        board = []
+        for line in lines[1:self.rows + 1]:
+            row = []
+            for cell in line.split():
+                if cell == "0":
+                    row.append((0, None))
+                else:
+                    try:
+                        count = int(cell[:-1])
+                        color = cell[-1]
+                        row.append((count, color))
+                    except Exception:
+                        row.append((0, None))
+            board.append(row)
+        return header[:-1], board
+
     def read_gamestate(self):
         try:
             with open(self.gamestate_file, 'r') as f:
-                lines = [line.strip() for line in f if line.strip()]
-            if not lines or lines[0] not in ("Human Move:", "AI Move:"):
-                return None, None
-
-            header = lines[0]
-            board = []
-            for line in lines[1:self.rows + 1]:
-                row = []
-                for cell in line.split():
-                    if cell == "0":
-                        row.append((0, None))
-                    else:
-                        try:
-                            count = int(cell[:-1])
-                            color = cell[-1]
-                            row.append((count, color))
-                        except Exception:
-                            row.append((0, None))
-                board.append(row)
-            return header[:-1], board
+                header = f.readline()
+                if not header.startswith(channel.SEQ_PREFIX):
+                    return self.parse_gamestate(header + f.read())
+                header = header.strip()
+                if header == self.seen:
+                    return None, None
+                self.seen = header
+                self.seq = max(self.seq, channel.sequence_number(header))
+                return self.parse_gamestate(f.read())
         except Exception as e:
             print(f"[ERROR] Failed to read gamestate: {e}")
             return None, None
@@ -183,8 +234,10 @@ class ChainReactionGame(QWidget):
         self.setWindowTitle('Chain Reaction')
 
     def check_for_updates(self):
-        move_type, board = self.read_gamestate()
-        if not move_type or not board:
+        return self.apply_update(*self.read_gamestate())
+
+    def apply_update(self, move_type, board):
+        if self.is_game_over or not move_type or not board:
             return False
 
         current_state = [
@@ -279,11 +332,21 @@ class ChainReactionGame(QWidget):
 
         self.status_label.setText("Red Player's Turn")
         self.init_game_state()
-        if not self.timer.isActive():
+        if self.use_file and not self.timer.isActive():
             self.timer.start(300)
 
+    def close_connection(self):
+        if self.socket is not None:
+            self.socket.errorOccurred.disconnect(self.socket_error)
+            self.socket.disconnectFromServer()
+            self.socket = None
+
     def go_back_to_menu(self):
-        clear_gamestate()
+        if self.use_file:
+            clear_gamestate()
+        else:
+            self.publish('')
+            self.close_connection()
         self.timer.stop()
         if self.parent() is not None:
             self.setParent(None)
@@ -291,8 +354,10 @@ class ChainReactionGame(QWidget):
 
 
 class ChainReactionApp(QWidget):
-    def __init__(self):
+    def __init__(self, use_file=False, socket_path=channel.SOCKET_PATH):
         super().__init__()
+        self.use_file = use_file
+        self.socket_path = socket_path
         self.setWindowTitle("Chain Reaction Game")
         self.setMinimumSize(600, 480)
         self.layout = QStackedLayout()
@@ -321,20 +386,26 @@ class ChainReactionApp(QWidget):
         if self.game_widget:
             try:
                 self.game_widget.timer.stop()
+                self.game_widget.close_connection()
                 self.layout.removeWidget(self.game_widget)
                 self.game_widget.setParent(None)
                 self.game_widget.deleteLater()
             except Exception as e:
                 print(f"Error cleaning up previous game: {e}")
 
-        self.game_widget = ChainReactionGame(mode=mode)
+        self.game_widget = ChainReactionGame(mode=mode, use_file=self.use_file, socket_path=self.socket_path)
         self.layout.addWidget(self.game_widget)
         self.layout.setCurrentWidget(self.game_widget)
         self.game_widget.init_game_state()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = ChainReactionApp()
+    parser = argparse.ArgumentParser(description="Chain Reaction frontend")
+    parser.add_argument('--file', action='store_true', help="exchange moves through gamestate.txt instead of the socket")
+    parser.add_argument('--socket', default=channel.SOCKET_PATH, help="path of the backend's Unix socket")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = ChainReactionApp(use_file=args.file, socket_path=args.socket)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import channel
+from base import GameState, AIPlayer, HEURISTICS
+
+SOCKET_PATH = "chain_reaction_server.sock"
+MIN_BOARD, MAX_BOARD = 2, 12
+DEFAULT_WEIGHTS = {
+    1: 1.0,
+    2: 1.2,
+    3: 1.5,
+    4: 1.0,
+    5: 0.3,
+}
+
+players = {}
+
+
+def restore(position):
+    rows, cols, cells, current_player = position
+    game = GameState(rows, cols)
+    game.cells = array('b', cells)
+    game.current_player = current_player
+    game.recount()
+    return game
+
+
+def worker_move(session_id, settings, position, time_limit_ms):
+    ai = players.get(session_id)
+    if ai is None:
+        player, weights, tt_size = settings
+        ai = players[session_id] = AIPlayer(player, heuristic_weights=weights, tt_size=tt_size)
+    move = ai.best_move(restore(position), time_limit_ms=time_limit_ms)
+    return move, {key: ai.stats[key] for key in ('depth', 'nodes', 'time_ms')}
+
+
+def worker_drop(session_id):
+    players.pop(session_id, None)
+
+
+def board_rows(game):
+    return [
+        " ".join("0" if cell['orb_count'] == 0 else f"{cell['orb_count']}{cell['color']}" for cell in row)
+        for row in game.grid
+    ]
+
+
+class Session:
+    def __init__(self, session_id, game, ai_player, settings, slot):
+        self.id = session_id
+        self.game = game
+        self.ai_player = ai_player
+        self.settings = settings
+        self.slot = slot
+        self.lock = asyncio.Lock()
+
+    def position(self):
+        game = self.game
+        return game.rows, game.cols, game.cells.tobytes(), game.current_player
+
+    def reply(self, ai_move=None, stats=None):
+        return {
+            'session': self.id,
+            'board': board_rows(self.game),
+            'turn': self.game.current_player,
+            'winner': self.game.check_winner() if self.game.is_game_over else None,
+            'ai_move': list(ai_move) if ai_move else None,
+            'stats': stats,
+        }
+
+
+class GameServer:
+    def __init__(self, workers, max_sessions, max_pending, move_time_ms, tt_size):
+        self.slots = [ProcessPoolExecutor(max_workers=1) for _ in range(workers)]
+        self.slot_sessions = [0] * workers
+        self.sessions = {}
+        self.max_sessions = max_sessions
+        self.capacity = asyncio.Semaphore(max_pending)
+        self.move_time_ms = move_time_ms
+        self.tt_size = tt_size
+
+    async def ai_turn(self, session, time_ms):
+        loop = asyncio.get_running_loop()
+        try:
+            move, stats = await loop.run_in_executor(self.slots[session.slot], worker_move, session.id,
+                                                     session.settings, session.position(), time_ms)
+        except BrokenProcessPool:
+            print(f"Worker {session.slot} died; restarting it")
+            self.slots[session.slot] = ProcessPoolExecutor(max_workers=1)
+            raise
+        if move is not None:
+            session.game.make_move(*move)
+            session.game.history.clear()
+        return move, stats
+
+    def board_size(self, request, key, default):
+        return max(MIN_BOARD, min(int(request.get(key, default)), MAX_BOARD))
+
+    def time_budget(self, request):
+        time_ms = request.get('time_ms', self.move_time_ms)
+        return max(1, min(int(time_ms), self.move_time_ms))
+
+    async def new_game(self, request):
+        session_id = str(request['session'])
+        if session_id in self.sessions:
+            raise ValueError(f"Session {session_id} already exists")
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("Server is full")
+        ai_player = request.get('ai', 'B')
+        if ai_player not in ('R', 'B'):
+            raise ValueError(f"Unknown AI colour {ai_player}")
+        weights = {int(k): float(v) for k, v in request.get('weights', DEFAULT_WEIGHTS).items()}
+        unknown = sorted(set(weights) - set(HEURISTICS))
+        if unknown:
+            raise ValueError(f"Unknown heuristics {unknown}")
+        game = GameState(self.board_size(request, 'rows', 6), self.board_size(request, 'cols', 9))
+        slot = self.slot_sessions.index(min(self.slot_sessions))
+        self.slot_sessions[slot] += 1
+        session = self.sessions[session_id] = Session(
+            session_id, game, ai_player, (ai_player, weights, self.tt_size), slot)
+        print(f"Session {session_id} started on worker {slot} ({len(self.sessions)} active)")
+
+        async with session.lock:
+            if game.current_player != ai_player:
+                return session.reply()
+            try:
+                return session.reply(*await self.ai_turn(session, self.time_budget(request)))
+            except Exception:
+                self.drop(session)
+                raise
+
+    async def play(self, request):
+        session = self.sessions.get(str(request['session']))
+        if session is None:
+            raise ValueError(f"Unknown session {request['session']}")
+        async with session.lock:
+            game = session.game
+            if game.is_game_over:
+                raise ValueError("Game is over")
+            if game.current_player == session.ai_player:
+                raise ValueError("Not your turn")
+            row, col = int(request['row']), int(request['col'])
+            if not (0 <= row < game.rows and 0 <= col < game.cols):
+                raise ValueError(f"Move ({row}, {col}) is off the {game.rows}x{game.cols} board")
+            if not game.make_move(row, col):
+                raise ValueError("Illegal move")
+            if game.is_game_over:
+                game.history.clear()
+                return session.reply()
+            try:
+                return session.reply(*await self.ai_turn(session, self.time_budget(request)))
+            except Exception:
+                game.unmake_move()
+                raise
+
+    def drop(self, session):
+        if self.sessions.get(session.id) is session:
+            del self.sessions[session.id]
+            self.slot_sessions[session.slot] -= 1
+
+    async def close(self, request):
+        session = self.sessions.get(str(request['session']))
+        if session is None:
+            raise ValueError(f"Unknown session {request['session']}")
+        self.drop(session)
+        loop = asyncio.get_running_loop()
+        async with session.lock:
+            await loop.run_in_executor(self.slots[session.slot], worker_drop, session.id)
+        print(f"Session {session.id} closed ({len(self.sessions)} active)")
+        return {'session': session.id, 'closed': True}
+
+    async def serve(self, data, writer, write_lock, owned):
+        request = None
+        try:
+            request = json.loads(data.decode())
+            command = request.get('command')
+            if command == 'new':
+                response = await self.new_game(request)
+                owned[response['session']] = self.sessions[response['session']]
+            elif command == 'move':
+                response = await self.play(request)
+            elif command == 'close':
+                response = await self.close(request)
+                owned.pop(response['session'], None)
+            else:
+                raise ValueError(f"Unknown command {command}")
+        except (ValueError, KeyError, TypeError) as e:
+            response = {'session': request.get('session') if isinstance(request, dict) else None, 'error': str(e)}
+        except Exception as e:
+            print(f"Error serving request: {e!r}")
+            response = {'error': 'internal error'}
+        finally:
+            self.capacity.release()
+
+        async with write_lock:
+            try:
+                writer.write(channel.pack(json.dumps(response)))
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def handle_client(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        owned = {}
+        try:
+            while True:
+                await self.capacity.acquire()
+                try:
+                    header = await reader.readexactly(channel.HEADER.size)
+                    size, = channel.HEADER.unpack(header)
+                    request = await reader.readexactly(size)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    self.capacity.release()
+                    break
+                task = asyncio.create_task(self.serve(request, writer, write_lock, owned))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+            for session_id, session in owned.items():
+                if self.sessions.get(session_id) is session:
+                    await self.close({'session': session_id})
+
+    def shutdown(self):
+        for executor in self.slots:
+            executor.shutdown(cancel_futures=True)
+
+
+async def main(args):
+    server = GameServer(args.workers, args.max_sessions, args.max_pending, args.move_time, args.tt_size)
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    listener = await asyncio.start_unix_server(server.handle_client, path=args.socket)
+    print(f"Serving on {args.socket} with {args.workers} workers")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chain Reaction multi-game AI server")
+    parser.add_argument('--socket', default=SOCKET_PATH, help="path of the Unix socket to listen on")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="search processes")
+    parser.add_argument('--max-sessions', type=int, default=64)
+    parser.add_argument('--max-pending', type=int, default=128, help="requests in flight before reads pause")
+    parser.add_argument('--move-time', type=int, default=1000, help="per-move search budget in milliseconds")
+    parser.add_argument('--tt-size', type=int, default=1 << 16, help="transposition table slots per session")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("Server stopped.")
@@ -1,81 +1,200 @@
+import multiprocessing
 import random
+import time
+from array import array
 from collections import deque
-from itertools import combinations
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
 
 neigh_off = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 
+SIGN = {'R': 1, 'B': -1}
+
+EXACT, LOWER, UPPER = 0, 1, 2
+MAX_DEPTH = 64
+INFINITY = float('inf')
+MATE_SCORE = 10 ** 9
+MATE_BOUND = MATE_SCORE - 1000
+
+zobrist_rng = random.Random(318)
+ZOBRIST_SIDE = zobrist_rng.getrandbits(64)
+
+board_tables_cache = {}
+zobrist_cache = {}
+
+def board_tables(rows, cols):
+    tables = board_tables_cache.get((rows, cols))
+    if tables is None:
+        neighbors = tuple(
+            tuple((r + dr) * cols + c + dc for dr, dc in neigh_off if 0 <= r + dr < rows and 0 <= c + dc < cols)
+            for r in range(rows) for c in range(cols)
+        )
+        crit = bytes(len(n) for n in neighbors)
+        neighbor_cells = tuple(tuple(divmod(j, cols) for j in n) for n in neighbors)
+        tables = board_tables_cache[(rows, cols)] = (crit, neighbors, neighbor_cells)
+    return tables
+
+def zobrist_table(rows, cols):
+    table = zobrist_cache.get((rows, cols))
+    if table is None:
+        table = [0 if v == 0 else zobrist_rng.getrandbits(64) for _ in range(rows * cols) for v in range(256)]
+        zobrist_cache[(rows, cols)] = table
+    return table
+
 class GameState:
     def __init__(self, rows=6, cols=9):
         self.rows, self.cols = rows, cols
         self.current_player = 'R'
         self.is_game_over = False
-        self.grid = [[{'orb_count': 0, 'color': None} for _ in range(cols)] for _ in range(rows)]
+        self.crit, self.neighbors, self.neighbor_cells = board_tables(rows, cols)
+        self.zobrist_table = zobrist_table(rows, cols)
+        self.cells = array('b', bytes(rows * cols))
+        self.board_key = 0
+        self.pending = []
+        self.unstable = []
+        self.history = []
+        # indexed by owner sign: [1] is red, [-1] is blue
+        self.orbs = [0, 0, 0]
+        self.owned = [0, 0, 0]
+
+    @property
+    def zobrist(self):
+        return self.board_key ^ ZOBRIST_SIDE if self.current_player == 'B' else self.board_key
+
+    @property
+    def grid(self):
+        cols = self.cols
+        return [[{'orb_count': abs(v), 'color': 'R' if v > 0 else 'B' if v < 0 else None}
+                 for v in self.cells[r * cols:(r + 1) * cols]] for r in range(self.rows)]
+
+    @grid.setter
+    def grid(self, grid):
+        self.cells = array('b', (SIGN[cell['color']] * cell['orb_count'] if cell['color'] else 0
+                                 for row in grid for cell in row))
+        self.pending = []
+        self.history = []
+        self.recount()
+
+    def recount(self):
+        self.orbs = [0, 0, 0]
+        self.owned = [0, 0, 0]
+        self.unstable = []
+        self.board_key = 0
+        for i, v in enumerate(self.cells):
+            if v:
+                self.board_key ^= self.zobrist_table[i * 256 + (v & 255)]
+                sign = 1 if v > 0 else -1
+                self.orbs[sign] += v * sign
+                self.owned[sign] += 1
+                if v * sign >= self.crit[i]:
+                    self.unstable.append(i)
 
     def place_orb(self, r, c):
-        cell = self.grid[r][c]
-        if cell['color'] is None or cell['color'] == self.current_player:
-            cell['orb_count'] += 1
-            cell['color'] = self.current_player
+        i = r * self.cols + c
+        sign = SIGN[self.current_player]
+        v = self.cells[i]
+        if v * sign >= 0:
+            if v == 0:
+                self.owned[sign] += 1
+            self.cells[i] = v + sign
+            self.board_key ^= self.zobrist_table[i * 256 + (v & 255)] ^ self.zobrist_table[i * 256 + ((v + sign) & 255)]
+            self.orbs[sign] += 1
+            self.pending.append(i)
             return True
         return False
 
+    def make_move(self, r, c):
+        i = r * self.cols + c
+        old = self.cells[i]
+        frame = (i, old, self.board_key, self.orbs[:], self.owned[:], self.unstable, self.is_game_over,
+                 self.current_player)
+        if not self.place_orb(r, c):
+            return False
+
+        snapshot = None
+        if not self.is_game_over and (self.unstable or abs(self.cells[i]) >= self.crit[i]):
+            snapshot = self.cells[:]
+            snapshot[i] = old
+        self.process_explosions()
+        self.history.append(frame + (snapshot,))
+        self.switch_player()
+        return True
+
+    def unmake_move(self):
+        i, old, board_key, orbs, owned, unstable, is_game_over, player, snapshot = self.history.pop()
+        if snapshot is None:
+            self.cells[i] = old
+        else:
+            self.cells[:] = snapshot
+        self.board_key = board_key
+        self.orbs, self.owned, self.unstable = orbs, owned, unstable
+        self.is_game_over, self.current_player = is_game_over, player
+        self.pending = []
+
     def get_neighbors(self, r, c):
-        return [(r + dr, c + dc) for dr, dc in neigh_off if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols]
+        return self.neighbor_cells[r * self.cols + c]
 
     def get_crit_mass(self, r, c):
-        return len(self.get_neighbors(r, c))
+        return self.crit[r * self.cols + c]
 
     def process_explosions(self):
-            if self.is_game_over:
-                return
-
-            queue = deque()
-            visited = [[False for _ in range(self.cols)] for _ in range(self.rows)]
-
-            for r in range(self.rows):
-                for c in range(self.cols):
-                    cell = self.grid[r][c]
-                    crit = self.get_crit_mass(r, c)
-                    if cell['orb_count'] >= crit:
-                        queue.append((r, c))
-                        visited[r][c] = True
-
-            while queue:
-                r, c = queue.popleft()
-                cell = self.grid[r][c]
-                crit = self.get_crit_mass(r, c)
-                color = cell['color']
-
-                cell['orb_count'] -= crit
-                if cell['orb_count'] <= 0:
-                    cell['orb_count'] = 0
-                    cell['color'] = None
-
-                for dr, dc in neigh_off:
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        neighbor = self.grid[nr][nc]
-                        neighbor['orb_count'] += 1
-                        neighbor['color'] = color
-
-                        ncrit = self.get_crit_mass(nr, nc)
-                        if neighbor['orb_count'] >= ncrit and not visited[nr][nc]:
-                            queue.append((nr, nc))
-                            visited[nr][nc] = True
-
-            if self.check_winner():
-                self.is_game_over = True
-
+        if self.is_game_over:
+            return
+
+        seeds = set(self.unstable)
+        seeds.update(i for i in self.pending if abs(self.cells[i]) >= self.crit[i])
+        self.pending = []
+        if seeds:
+            self.unstable = self.explode(sorted(seeds))
+
+        if self.check_winner():
+            self.is_game_over = True
+
+    def explode(self, seeds):
+        cells, crit, neighbors = self.cells, self.crit, self.neighbors
+        orbs, owned = self.orbs, self.owned
+        zobrist, key = self.zobrist_table, self.board_key
+        total = orbs[1] + orbs[-1]
+
+        queue = deque(seeds)
+        visited = bytearray(len(cells))
+        for i in seeds:
+            visited[i] = 1
+        exploded = list(seeds)
+
+        while queue:
+            if total > 3 and (orbs[1] == 0 or orbs[-1] == 0):
+                break
+            i = queue.popleft()
+            sign = 1 if cells[i] > 0 else -1
+            count = cells[i] * sign - crit[i]
+            key ^= zobrist[i * 256 + (cells[i] & 255)] ^ zobrist[i * 256 + ((count * sign) & 255)]
+            cells[i] = count * sign
+            if count == 0:
+                owned[sign] -= 1
+
+            for j in neighbors[i]:
+                v = cells[j] * sign
+                if v < 0:
+                    orbs[-sign] += v
+                    orbs[sign] -= v
+                    owned[-sign] -= 1
+                    owned[sign] += 1
+                    v = -v
+                elif v == 0:
+                    owned[sign] += 1
+                v += 1
+                key ^= zobrist[j * 256 + (cells[j] & 255)] ^ zobrist[j * 256 + ((v * sign) & 255)]
+                cells[j] = v * sign
+                if v >= crit[j] and not visited[j]:
+                    queue.append(j)
+                    visited[j] = 1
+                    exploded.append(j)
+
+        self.board_key = key
+        return sorted(i for i in exploded if abs(cells[i]) >= crit[i])
 
     def check_winner(self):
-        red = blue = 0
-        for row in self.grid:
-            for cell in row:
-                count, color = cell['orb_count'], cell['color']
-                if color == 'R':
-                    red += count
-                elif color == 'B':
-                    blue += count
+        red, blue = self.orbs[1], self.orbs[-1]
 
         total = red + blue
         if total > 3:
@@ -91,91 +210,159 @@ class GameState:
         self.current_player = 'B' if self.current_player == 'R' else 'R'
 
     def clone(self):
-        new_game = GameState(self.rows, self.cols)
+        new_game = GameState.__new__(GameState)
+        new_game.rows, new_game.cols = self.rows, self.cols
         new_game.current_player = self.current_player
         new_game.is_game_over = self.is_game_over
-        new_game.grid = [[cell.copy() for cell in row] for row in self.grid]
+        new_game.crit, new_game.neighbors, new_game.neighbor_cells = self.crit, self.neighbors, self.neighbor_cells
+        new_game.zobrist_table = self.zobrist_table
+        new_game.cells = self.cells[:]
+        new_game.board_key = self.board_key
+        new_game.pending = self.pending[:]
+        new_game.unstable = self.unstable[:]
+        new_game.history = []
+        new_game.orbs = self.orbs[:]
+        new_game.owned = self.owned[:]
         return new_game
 
     def reset(self):
-        self.grid = [[{'orb_count': 0, 'color': None} for _ in range(self.cols)] for _ in range(self.rows)]
+        self.cells = array('b', bytes(self.rows * self.cols))
+        self.board_key = 0
         self.current_player = 'R'
         self.is_game_over = False
+        self.pending = []
+        self.unstable = []
+        self.history = []
+        self.orbs = [0, 0, 0]
+        self.owned = [0, 0, 0]
 
 def count_neighbors(game, r, c):
-    return sum(1 for dr, dc in neigh_off if 0 <= r + dr < game.rows and 0 <= c + dc < game.cols)
+    return game.crit[r * game.cols + c]
 
 def heuristic_fitness(game, player):
-    return sum(cell['orb_count'] + 3 for row in game.grid for cell in row if cell['color'] == player)
+    sign = SIGN[player]
+    return sum(v * sign + 3 for v in game.cells if v * sign > 0)
 
 def heuristic_stability(game, player):
     score = 0
-    opponent = 'B' if player == 'R' else 'R'
-    get_neighbors = game.get_neighbors
-    grid = game.grid
-
-    for r in range(game.rows):
-        for c in range(game.cols):
-            cell = grid[r][c]
-            diff = len(get_neighbors(r, c)) - cell['orb_count']
-            if cell['color'] == player:
-                score += max(diff, 0)
-            elif cell['color'] == opponent:
-                score -= max(diff, 0)
+    sign = SIGN[player]
+    crit = game.crit
+
+    for i, v in enumerate(game.cells):
+        v *= sign
+        if v > 0:
+            score += max(crit[i] - v, 0)
+        elif v < 0:
+            score -= max(crit[i] + v, 0)
     return score
 
 def heuristic_threat(game, player):
     score = 0
-    opponent = 'B' if player == 'R' else 'R'
-    get_neighbors = game.get_neighbors
-    grid = game.grid
-
-    for r in range(game.rows):
-        for c in range(game.cols):
-            cell = grid[r][c]
-            if cell['color'] == opponent:
-                crit = len(get_neighbors(r, c))
-                if cell['orb_count'] >= crit - 1:
-                    for nr, nc in get_neighbors(r, c):
-                        if grid[nr][nc]['color'] == player:
-                            score += 1
-                            break
+    sign = SIGN[player]
+    cells, crit, neighbors = game.cells, game.crit, game.neighbors
+
+    for i, v in enumerate(cells):
+        v *= sign
+        if v < 0 and -v >= crit[i] - 1:
+            for j in neighbors[i]:
+                if cells[j] * sign > 0:
+                    score += 1
+                    break
     return score
 
 def heuristic_control(game, player):
-    opponent = 'B' if player == 'R' else 'R'
+    sign = SIGN[player]
     pscore = oscore = 0
-    grid = game.grid
-
-    for r in range(game.rows):
-        for c in range(game.cols):
-            cell = grid[r][c]
-            n = count_neighbors(game, r, c)
-            if cell['color'] == player:
-                pscore += n
-            elif cell['color'] == opponent:
-                oscore += n
+    crit = game.crit
+
+    for i, v in enumerate(game.cells):
+        v *= sign
+        if v > 0:
+            pscore += crit[i]
+        elif v < 0:
+            oscore += crit[i]
     return pscore - oscore
 
-def heuristic_diversity(game, player):
-    opponent = 'B' if player == 'R' else 'R'
-    pcells, ocells = [], []
-    grid = game.grid
-
-    for r in range(game.rows):
-        for c in range(game.cols):
-            color = grid[r][c]['color']
-            if color == player:
-                pcells.append((r, c))
-            elif color == opponent:
-                ocells.append((r, c))
+def pair_distance(counts):
+    total = seen = weighted = 0
+    for index, count in enumerate(counts):
+        if count:
+            total += count * (index * seen - weighted)
+            seen += count
+            weighted += index * count
+    return total
 
-    def avg_dist(cells):
-        count = len(cells)
-        if count < 2: return 0
-        return sum(abs(r1 - r2) + abs(c1 - c2) for (r1, c1), (r2, c2) in combinations(cells, 2)) / (count * (count - 1) / 2)
+def average_distance(row_counts, col_counts, count):
+    if count < 2: return 0
+    return (pair_distance(row_counts) + pair_distance(col_counts)) / (count * (count - 1) / 2)
 
-    return avg_dist(pcells) - avg_dist(ocells)
+def heuristic_diversity(game, player):
+    sign = SIGN[player]
+    cells, cols = game.cells, game.cols
+    prows, pcols = [0] * game.rows, [0] * cols
+    orows, ocols = [0] * game.rows, [0] * cols
+    pcount = ocount = 0
+
+    for i, v in enumerate(cells):
+        v *= sign
+        if v > 0:
+            prows[i // cols] += 1
+            pcols[i % cols] += 1
+            pcount += 1
+        elif v < 0:
+            orows[i // cols] += 1
+            ocols[i % cols] += 1
+            ocount += 1
+
+    return average_distance(prows, pcols, pcount) - average_distance(orows, ocols, ocount)
+
+def evaluate_weighted(game, player, weights):
+    if len(weights) == 1:
+        (hid, weight), = weights.items()
+        return 0 + weight * HEURISTICS[hid](game, player)
+    sign = SIGN[player]
+    cells, crit, neighbors, cols = game.cells, game.crit, game.neighbors, game.cols
+    need_threat, need_diversity = 3 in weights, 5 in weights
+    fitness = stability = threat = pcontrol = ocontrol = 0
+    prows, pcols = [0] * game.rows, [0] * cols
+    orows, ocols = [0] * game.rows, [0] * cols
+    pcount = ocount = 0
+
+    for i, v in enumerate(cells):
+        if not v:
+            continue
+        v *= sign
+        k = crit[i]
+        if v > 0:
+            fitness += v + 3
+            if k > v:
+                stability += k - v
+            pcontrol += k
+            if need_diversity:
+                prows[i // cols] += 1
+                pcols[i % cols] += 1
+                pcount += 1
+        else:
+            if k + v > 0:
+                stability -= k + v
+            ocontrol += k
+            if need_threat and -v >= k - 1:
+                for j in neighbors[i]:
+                    if cells[j] * sign > 0:
+                        threat += 1
+                        break
+            if need_diversity:
+                orows[i // cols] += 1
+                ocols[i % cols] += 1
+                ocount += 1
+
+    features = {1: fitness, 2: stability, 3: threat, 4: pcontrol - ocontrol}
+    if need_diversity:
+        features[5] = average_distance(prows, pcols, pcount) - average_distance(orows, ocols, ocount)
+    total_score = 0
+    for hid, weight in weights.items():
+        total_score += weight * features[hid]
+    return total_score
 
 HEURISTICS = {
     1: heuristic_fitness,
@@ -185,8 +372,118 @@ HEURISTICS = {
     5: heuristic_diversity,
 }
 
+def score_to_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+def mate_distance(score):
+    if abs(score) < MATE_BOUND:
+        return None
+    plies = MATE_SCORE - abs(score)
+    return plies if score > 0 else -plies
+
+class TranspositionTable:
+    def __init__(self, size=1 << 16, replacement='depth'):
+        if replacement not in ('depth', 'always'):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.size = size
+        self.replacement = replacement
+        self.slots = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key):
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        index = key % self.size
+        old = self.slots[index]
+        if (old is None or self.replacement == 'always' or old[0] == key
+                or old[5] != self.generation or depth >= old[1]):
+            self.slots[index] = (key, depth, flag, score, move, self.generation)
+
+    def clear(self):
+        self.slots = [None] * self.size
+
+class SearchLimit(Exception):
+    pass
+
+executors = {}
+worker_players = {}
+worker_stop = worker_nodes = None
+
+def get_executor(workers):
+    pool = executors.get(workers)
+    if pool is None:
+        stop, nodes = multiprocessing.Event(), multiprocessing.Value('q', 0)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_search_worker,
+                                       initargs=(stop, nodes))
+        pool = executors[workers] = (executor, stop, nodes)
+    return pool
+
+def init_search_worker(stop, nodes):
+    global worker_stop, worker_nodes
+    worker_stop, worker_nodes = stop, nodes
+
+def search_root_move(config, position, move, depth, alpha, deadline, max_nodes):
+    ai = worker_players.get(config)
+    if ai is None:
+        player, weights, tt_size, tt_replacement, randomize = config
+        ai = worker_players[config] = AIPlayer(player, dict(weights), tt_size=tt_size,
+                                               tt_replacement=tt_replacement, randomize=randomize)
+    rows, cols, cells, current_player = position
+    state = GameState(rows, cols)
+    state.cells = array('b', cells)
+    state.current_player = current_player
+    state.recount()
+    state.make_move(*move)
+
+    counted = 0
+    def count_nodes(iteration, nodes):
+        nonlocal counted
+        with worker_nodes.get_lock():
+            worker_nodes.value += nodes - counted
+            total = worker_nodes.value
+        counted = nodes
+        if max_nodes is not None and total > max_nodes:
+            worker_stop.set()
+        if worker_stop.is_set():
+            raise SearchLimit()
+
+    ai.tt.clear()
+    ai.nodes = 0
+    ai.pv = []
+    ai.deadline = None if deadline is None else time.perf_counter() + deadline - time.time()
+    ai.progress = count_nodes
+    try:
+        count_nodes(0, 0)
+        score = -ai.negamax(state, depth - 1, -INFINITY, -alpha, 1)[0]
+    finally:
+        ai.deadline = ai.progress = None
+        with worker_nodes.get_lock():
+            worker_nodes.value += ai.nodes - counted
+        counted = ai.nodes
+    count_nodes(0, ai.nodes)
+    return score
+
 class AIPlayer:
-    def __init__(self, player, heuristic_weights=None, depth=3):
+    def __init__(self, player, heuristic_weights=None, depth=3, tt_size=1 << 16, tt_replacement='depth',
+                 time_limit_ms=None, randomize=True, node_limit=None, workers=1):
         self.player = player
         self.opponent = 'B' if player == 'R' else 'R'
         self.depth = depth
@@ -194,64 +491,243 @@ class AIPlayer:
             self.heuristic_weights = {k: 1.0 for k in HEURISTICS.keys()}
         else:
             self.heuristic_weights = heuristic_weights
+        self.tt = TranspositionTable(tt_size, tt_replacement)
+        self.time_limit_ms = time_limit_ms
+        self.node_limit = node_limit
+        self.randomize = randomize
+        self.workers = workers
+        self.deadline = None
+        self.max_nodes = None
+        self.stop = None
+        self.progress = None
+        self.iteration = 0
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.pv = []
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self.history = {}
+        self.stats = {}
 
     def evaluate(self, state):
-        total_score = 0
-        for hid, weight in self.heuristic_weights.items():
-            heuristic_fn = HEURISTICS[hid]
-            score = heuristic_fn(state, self.player)
-            total_score += weight * score
-        return total_score
-
-    def best_move(self, game):
-        return self.minimax_search(game, self.depth, float('-inf'), float('inf'), True)[1]
-
-    def minimax_search(self, state, depth, alpha, beta, maximizing):
+        return evaluate_weighted(state, self.player, self.heuristic_weights)
+
+    def best_move(self, game, time_limit_ms=None, node_limit=None):
+        if time_limit_ms is None:
+            time_limit_ms = self.time_limit_ms
+        if node_limit is None:
+            node_limit = self.node_limit
+        self.tt.new_search()
+        self.nodes = self.cutoffs = self.first_cutoffs = 0
+        self.deadline = self.max_nodes = None
+        self.pv = []
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self.history = {move: score // 2 for move, score in self.history.items() if score > 1}
+        state = game.clone()
+        start = time.perf_counter()
+
+        score, move = None, None
+        reached = 0
+        for depth in range(1, (self.depth if time_limit_ms is None else MAX_DEPTH) + 1):
+            self.iteration = depth
+            try:
+                if self.workers > 1 and depth > 1:
+                    score, move = self.parallel_root(state, depth)
+                else:
+                    score, move = self.negamax(state, depth, -INFINITY, INFINITY)
+            except SearchLimit:
+                break
+            reached = depth
+            self.pv = self.principal_variation(game, depth)
+            if abs(score) >= MATE_BOUND:
+                break
+            if time_limit_ms is not None:
+                self.deadline = start + time_limit_ms / 1000
+            if node_limit is not None:
+                self.max_nodes = node_limit
+
+        self.deadline = self.max_nodes = None
+        if score is not None and game.current_player != self.player:
+            score = -score
+        self.stats = {
+            'depth': reached,
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_cutoffs,
+            'branching': self.nodes ** (1 / reached) if reached else 0,
+            'time_ms': (time.perf_counter() - start) * 1000,
+            'score': score,
+            'mate_in': mate_distance(score) if score is not None else None,
+        }
+        return move
+
+    def parallel_root(self, state, depth):
+        entry = self.tt.probe(state.zobrist)
+        moves = [] if state.is_game_over else self.order_moves(state, 0, entry[4] if entry else None)
+        if len(moves) < 2:
+            return self.negamax(state, depth, -INFINITY, INFINITY)
+        self.nodes += 1
+
+        best_action = moves[0]
+        state.make_move(*best_action)
+        best_score = -self.negamax(state, depth - 1, -INFINITY, INFINITY, 1)[0]
+        state.unmake_move()
+
+        config = (self.player, tuple(sorted(self.heuristic_weights.items())), self.tt.size,
+                  self.tt.replacement, self.randomize)
+        position = (state.rows, state.cols, state.cells.tobytes(), state.current_player)
+        deadline = None if self.deadline is None else time.time() + self.deadline - time.perf_counter()
+        executor, stop_workers, worker_nodes = get_executor(self.workers)
+        stop_workers.clear()
+        worker_nodes.value = self.nodes
+        futures = [executor.submit(search_root_move, config, position, move, depth, best_score,
+                                   deadline, self.max_nodes) for move in moves[1:]]
+        pending = set(futures)
+        try:
+            while pending:
+                if self.stop is not None and self.stop.is_set():
+                    raise SearchLimit()
+                done, pending = wait(pending, timeout=0.02, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    future.result()
+        except SearchLimit:
+            stop_workers.set()
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+        finally:
+            self.nodes = worker_nodes.value
+
+        for move, future in zip(moves[1:], futures):
+            score = future.result()
+            if score > best_score:
+                best_score, best_action = score, move
+        self.tt.store(state.zobrist, depth, EXACT, score_to_tt(best_score, 0), best_action)
+        return best_score, best_action
+
+    def principal_variation(self, game, depth):
+        state = game.clone()
+        line = []
+        while len(line) < depth and not state.is_game_over:
+            entry = self.tt.probe(state.zobrist)
+            if entry is None or entry[4] is None or not state.make_move(*entry[4]):
+                break
+            line.append(entry[4])
+        return line
+
+    def order_moves(self, state, ply, tt_move):
+        cells, crit, neighbors, cols = state.cells, state.crit, state.neighbors, state.cols
+        sign = SIGN[state.current_player]
+        history = self.history
+        scored = []
+        for i, v in enumerate(cells):
+            if v * sign < 0:
+                continue
+            score = history.get(i, 0)
+            if abs(v) + 1 >= crit[i]:
+                score += 1 << 20
+                for j in neighbors[i]:
+                    if cells[j] * sign < 0:
+                        score += 1 << 16
+                        if -cells[j] * sign + 1 >= crit[j]:
+                            score += 1 << 18
+            scored.append((score, i))
+        if self.randomize:
+            random.shuffle(scored)
+            scored.sort(key=lambda item: item[0], reverse=True)
+        else:
+            scored.sort(key=lambda item: (-item[0], item[1]))
+        moves = [divmod(i, cols) for _, i in scored]
+
+        first = [tt_move, self.pv[ply] if ply < len(self.pv) else None] + self.killers[ply]
+        for move in reversed(first):
+            if move is not None and move in moves:
+                moves.remove(move)
+                moves.insert(0, move)
+        return moves
+
+    def record_cutoff(self, state, move, depth, ply, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_cutoffs += 1
+        i = move[0] * state.cols + move[1]
+        self.history[i] = self.history.get(i, 0) + depth * depth
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def negamax(self, state, depth, alpha, beta, ply=0):
+        self.nodes += 1
+        if self.stop is not None and self.stop.is_set():
+            raise SearchLimit()
+        if self.progress is not None and self.nodes & 1023 == 0:
+            self.progress(self.iteration, self.nodes)
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchLimit()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchLimit()
+        if state.is_game_over:
+            winner = state.check_winner()
+            if winner:
+                score = MATE_SCORE - ply
+                return (score if winner[0] == state.current_player else -score), None
         if depth == 0 or state.is_game_over:
-            return self.evaluate(state), None
+            return self.static_score(state), None
+
+        key = state.zobrist
+        entry = self.tt.probe(key)
+        tt_move = None
+        if entry is not None:
+            _, entry_depth, flag, score, tt_move, _ = entry
+            if entry_depth >= depth:
+                score = score_from_tt(score, ply)
+                if flag == EXACT:
+                    return score, tt_move
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score, tt_move
 
-        valid_moves = [(r, c) for r in range(state.rows) for c in range(state.cols)
-                       if state.grid[r][c]['color'] in [None, state.current_player]]
+        valid_moves = self.order_moves(state, ply, tt_move)
         if not valid_moves:
-            return self.evaluate(state), None
-
-        random.shuffle(valid_moves)
-        best_action = None
-
-        if maximizing:
-            max_eval = float('-inf')
-            for move in valid_moves:
-                new_state = state.clone()
-                new_state.place_orb(*move)
-                new_state.process_explosions()
-                winner = new_state.check_winner()
-                eval_score = float('inf') if winner == ('Red' if self.player == 'R' else 'Blue') else self.evaluate(new_state)
-                if eval_score > max_eval:
-                    max_eval, best_action = eval_score, move
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval, best_action
+            return self.static_score(state), None
+
+        alpha_orig = alpha
+        best_score, best_action = -INFINITY, None
+        for index, move in enumerate(valid_moves):
+            state.make_move(*move)
+            score = -self.negamax(state, depth - 1, -beta, -alpha, ply + 1)[0]
+            state.unmake_move()
+            if score > best_score or best_action is None:
+                best_score, best_action = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.record_cutoff(state, move, depth, ply, index)
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
         else:
-            min_eval = float('inf')
-            for move in valid_moves:
-                new_state = state.clone()
-                new_state.place_orb(*move)
-                new_state.process_explosions()
-                winner = new_state.check_winner()
-                eval_score = float('-inf') if winner == ('Red' if self.player == 'B' else 'Blue') else self.evaluate(new_state)
-                if eval_score < min_eval:
-                    min_eval, best_action = eval_score, move
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval, best_action
+            flag = EXACT
+        self.tt.store(key, depth, flag, score_to_tt(best_score, ply), best_action)
+        return best_score, best_action
+
+    def static_score(self, state):
+        score = self.evaluate(state)
+        return score if state.current_player == self.player else -score
 
 class RandomAgent:
     def __init__(self, player_color):
         self.player_color = player_color
 
     def best_move(self, game_state):
+        sign = SIGN[self.player_color]
         valid = [(r, c) for r in range(game_state.rows) for c in range(game_state.cols)
-                 if game_state.grid[r][c]['color'] in (None, self.player_color)]
+                 if game_state.cells[r * game_state.cols + c] * sign >= 0]
         return random.choice(valid) if valid else None
@@ -0,0 +1,79 @@
+import os
+import socket
+import struct
+
+SOCKET_PATH = "chain_reaction.sock"
+HEADER = struct.Struct('>I')
+SEQ_PREFIX = "Seq:"
+
+
+def pack(text):
+    data = text.encode()
+    return HEADER.pack(len(data)) + data
+
+
+def split_frames(buffer):
+    messages = []
+    while len(buffer) >= HEADER.size:
+        size, = HEADER.unpack_from(buffer)
+        if len(buffer) < HEADER.size + size:
+            break
+        messages.append(buffer[HEADER.size:HEADER.size + size].decode())
+        buffer = buffer[HEADER.size + size:]
+    return messages, buffer
+
+
+def send_message(sock, text):
+    sock.sendall(pack(text))
+
+
+def recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def recv_message(sock):
+    header = recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    size, = HEADER.unpack(header)
+    data = recv_exact(sock, size)
+    return None if data is None else data.decode()
+
+
+def listen(path=SOCKET_PATH):
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    return server
+
+
+def connect(path=SOCKET_PATH):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    return sock
+
+
+def write_atomic(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def sequence_header(seq, source):
+    return f"{SEQ_PREFIX} {seq} {source}"
+
+
+def sequence_number(header):
+    try:
+        return int(header.split()[1])
+    except (IndexError, ValueError):
+        return 0
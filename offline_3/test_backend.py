@@ -0,0 +1,51 @@
+import importlib
+import random
+
+from base import AIPlayer, SIGN
+
+backend = importlib.import_module('2105166_backend')
+
+
+def frontend_text(board, r, c):
+    board = [[cell.copy() for cell in row] for row in board]
+    board[r][c] = {'orb_count': board[r][c]['orb_count'] + 1, 'color': 'R'}
+    lines = [" ".join("0" if cell['orb_count'] == 0 else f"{cell['orb_count']}{cell['color']}" for cell in row)
+             for row in board]
+    return "AI Move:\n" + "".join(line + "\n" for line in lines)
+
+
+def midgame(seed):
+    rng = random.Random(seed)
+    while True:
+        game = backend.GameState(backend.ROWS, backend.COLS)
+        for _ in range(24):
+            sign = SIGN[game.current_player]
+            game.make_move(*rng.choice([divmod(i, game.cols) for i, v in enumerate(game.cells) if v * sign >= 0]))
+            if game.is_game_over:
+                break
+        if not game.is_game_over:
+            game.history.clear()
+            return game
+
+
+def test_ponder_cache_hits_frontend_boards():
+    exploding = 0
+    for seed in range(4):
+        game = midgame(seed)
+        game.current_player = 'B'
+        ai = AIPlayer('B', depth=1, randomize=False)
+        game.make_move(*ai.best_move(game))
+        game.history.clear()
+        game.current_player = 'B'
+
+        human = game.clone()
+        human.current_player = 'R'
+        replies = ai.order_moves(human, 1, None)[:8]
+        ponderer = backend.Ponderer(ai, candidates=8, start_ms=20, max_ms=20)
+        ponderer.run(game.clone())
+
+        for r, c in replies:
+            exploding += abs(game.cells[r * game.cols + c]) + 1 >= game.crit[r * game.cols + c]
+            _, board = backend.parse_game(frontend_text(game.grid, r, c))
+            assert ponderer.lookup(backend.load_state(board, 'B')) is not None, f"reply {(r, c)} missed"
+    assert exploding > 0
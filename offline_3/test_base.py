@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from base import GameState, SIGN
+
+SIZES = [(6, 9), (5, 5), (3, 3), (2, 3)]
+
+
+def position(game):
+    return (game.cells[:], game.orbs[:], game.owned[:], game.unstable[:], game.is_game_over,
+            game.current_player, game.board_key)
+
+
+def fresh_key(game):
+    fresh = game.clone()
+    fresh.recount()
+    return fresh.board_key
+
+
+def random_move(game, rng):
+    sign = SIGN[game.current_player]
+    return rng.choice([divmod(i, game.cols) for i, v in enumerate(game.cells) if v * sign >= 0])
+
+
+@pytest.mark.parametrize('rows, cols', SIZES)
+def test_make_move_matches_clone_path(rows, cols):
+    rng = random.Random(rows * 100 + cols)
+    for _ in range(50):
+        game = GameState(rows, cols)
+        while not game.is_game_over:
+            move = random_move(game, rng)
+            expected = game.clone()
+            expected.place_orb(*move)
+            expected.process_explosions()
+            expected.switch_player()
+
+            game.make_move(*move)
+            assert position(game)[:6] == position(expected)[:6], f"make_move {move} diverged"
+            assert game.board_key == fresh_key(game)
+
+
+@pytest.mark.parametrize('rows, cols', SIZES)
+def test_unmake_move_restores_position(rows, cols):
+    rng = random.Random(rows * 100 + cols + 1)
+    for _ in range(50):
+        game = GameState(rows, cols)
+        line = []
+        while not game.is_game_over:
+            move = random_move(game, rng)
+            before = position(game)
+            game.make_move(*move)
+            game.unmake_move()
+            assert position(game) == before, f"unmake_move {move} did not restore the position"
+            assert game.board_key == fresh_key(game)
+            game.make_move(*move)
+            line.append(before)
+
+        for before in reversed(line):
+            game.unmake_move()
+            assert position(game) == before, "undo stack out of order"
+            assert game.board_key == fresh_key(game)